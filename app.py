@@ -2,65 +2,27 @@ import os
 import json
 from flask import (
     Flask, render_template, request, redirect,
-    url_for, session, flash, jsonify
+    url_for, session, flash, jsonify, Response, stream_with_context, send_file
 )
 
-# ---------- Pandas / openpyxl for reading users.xlsx ----------
-try:
-    import pandas as pd
-    _use_pandas = True
-except ImportError:
-    _use_pandas = False
-
-try:
-    import openpyxl
-    _use_openpyxl = True
-except ImportError:
-    _use_openpyxl = False
-
 # ---------- Bot service ----------
 import bot_service
+from credentials import CredentialStore
+from log_store import LEVELS
+from metrics import to_prometheus
+from profiling import SORT_KEYS, profile_path, top_text
+from run_report import report_path, iter_jsonl, iter_csv
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)   # secure random secret
 
 USERS_FILE = os.path.join(os.path.dirname(__file__), "users.xlsx")
+credentials = CredentialStore(USERS_FILE)
 
 
 # ==========================================
 # Auth helpers
 # ==========================================
-def load_users():
-    """Load username/password pairs from users.xlsx.
-    Returns dict {username: password} or raises RuntimeError."""
-    if not os.path.exists(USERS_FILE):
-        raise RuntimeError(f"ไม่พบไฟล์ {USERS_FILE}")
-
-    users = {}
-    if _use_pandas:
-        df = pd.read_excel(USERS_FILE)
-        df.columns = [c.strip().lower() for c in df.columns]
-        for _, row in df.iterrows():
-            u = str(row.get("username", "")).strip()
-            p = str(row.get("password", "")).strip()
-            if u:
-                users[u] = p
-    elif _use_openpyxl:
-        wb = openpyxl.load_workbook(USERS_FILE)
-        ws = wb.active
-        headers = [str(c.value).strip().lower() if c.value else "" for c in ws[1]]
-        u_col = headers.index("username") if "username" in headers else 0
-        p_col = headers.index("password") if "password" in headers else 1
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            u = str(row[u_col]).strip() if row[u_col] else ""
-            p = str(row[p_col]).strip() if row[p_col] else ""
-            if u:
-                users[u] = p
-    else:
-        raise RuntimeError("ต้องติดตั้ง pandas หรือ openpyxl ก่อน")
-    return users
-
-
 def login_required(f):
     from functools import wraps
     @wraps(f)
@@ -89,8 +51,7 @@ def login():
         password = request.form.get("password", "").strip()
 
         try:
-            users = load_users()
-            if username in users and users[username] == password:
+            if credentials.verify(username, password):
                 session["user"] = username
                 flash(f"ยินดีต้อนรับ, {username}! 🎉", "success")
                 return redirect(url_for("dashboard"))
@@ -179,9 +140,18 @@ def api_bot_start():
             "manual_pages": manual_pages,
             "auto_start_first_round": data.get("auto_start_first_round", True),
             "headless": data.get("headless", True),
+            "keep_warm": data.get("keep_warm", False),
             "text_pool_raw": data.get("text_pool_raw", ""),
+            "page_timeout": float(data.get("page_timeout", 10)),
+            "confirm_timeout": float(data.get("confirm_timeout", 5)),
+            "use_schema_cache": data.get("use_schema_cache", True),
+            "profile": bool(data.get("profile", False)),
         }
 
+        seed = str(data.get("seed", "")).strip()
+        if seed:
+            config["seed"] = int(seed) if seed.lstrip("-").isdigit() else seed
+
         if not config["url"]:
             return jsonify({"ok": False, "error": "กรุณาใส่ URL"}), 400
 
@@ -205,7 +175,68 @@ def api_bot_stop():
 @app.route("/api/bot/status")
 @login_required
 def api_bot_status():
-    return jsonify(bot_service.get_status())
+    """รองรับ If-None-Match — ถ้าสถานะไม่เปลี่ยนตั้งแต่ครั้งก่อนจะตอบ 304"""
+    version, status = bot_service.status_snapshot()
+    # metrics ใหญ่และเปลี่ยนทุกรอบ — อ่านแยกที่ /api/bot/metrics
+    resp = jsonify({k: v for k, v in status.items() if k != "metrics"})
+    resp.set_etag(f"{bot_service.bot_status.epoch}-{version}")
+    resp.headers["Cache-Control"] = "no-cache"
+    return resp.make_conditional(request)
+
+
+@app.route("/api/bot/metrics")
+@login_required
+def api_bot_metrics():
+    """เวลาแต่ละช่วง (p50/p95/max) + จำนวนคำสั่ง WebDriver ต่อรอบ
+    ?format=prometheus → text exposition format สำหรับ scrape"""
+    snap = bot_service.get_metrics()
+    if request.args.get("format") == "prometheus":
+        return Response(to_prometheus(snap), mimetype="text/plain; version=0.0.4")
+    return jsonify(snap)
+
+
+@app.route("/api/bot/profile")
+@login_required
+def api_bot_profile():
+    """ไฟล์ profile ของงานล่าสุดที่รันด้วย "profile": true
+    ?kind=pstats | collapsed (ดาวน์โหลด) | text (สรุป top ฟังก์ชัน) — ไม่ระบุ = ข้อมูล profile"""
+    info = bot_service.get_status().get("profile")
+    if not info:
+        return jsonify({"ok": False, "error": "ยังไม่มี profile"}), 404
+    kind = request.args.get("kind")
+    if not kind:
+        return jsonify({"ok": True, **info})
+    if kind == "text":
+        sort = request.args.get("sort", "cumulative")
+        if sort not in SORT_KEYS:
+            return jsonify({"ok": False, "error": f"sort ต้องเป็นหนึ่งใน {', '.join(SORT_KEYS)}"}), 400
+        text = top_text(info["id"], sort=sort)
+        if text is None:
+            return jsonify({"ok": False, "error": "ไม่พบไฟล์ profile"}), 404
+        return Response(text, mimetype="text/plain")
+    path = profile_path(info["id"], kind)
+    if path is None:
+        return jsonify({"ok": False, "error": "ไม่พบไฟล์ profile"}), 404
+    return send_file(path, as_attachment=True, download_name=os.path.basename(path))
+
+
+@app.route("/api/bot/report")
+@login_required
+def api_bot_report():
+    """รายงานรายรอบของงาน (ค่าเริ่มต้น = งานล่าสุด) แบบ stream ทีละบรรทัด
+    ?format=jsonl | csv  &id=<report id>"""
+    report_id = request.args.get("id") or bot_service.get_status().get("report")
+    path = report_path(report_id)
+    if path is None:
+        return jsonify({"ok": False, "error": "ไม่พบรายงาน"}), 404
+    if request.args.get("format") == "csv":
+        resp = Response(iter_csv(path), mimetype="text/csv; charset=utf-8")
+        ext = "csv"
+    else:
+        resp = Response(iter_jsonl(path), mimetype="application/x-ndjson")
+        ext = "jsonl"
+    resp.headers["Content-Disposition"] = f"attachment; filename={report_id}.{ext}"
+    return resp
 
 
 @app.route("/api/bot/answer", methods=["POST"])
@@ -225,19 +256,77 @@ def api_bot_answer():
 @app.route("/api/bot/logs")
 @login_required
 def api_bot_logs():
-    offset = int(request.args.get("offset", 0))
-    logs = bot_service.bot_status.get("logs", [])
+    """?since=<seq>&level=warn,error&round=2&limit=200 — อ่าน log ต่อจาก seq ที่ได้ครั้งก่อน"""
+    since = request.args.get("since", 0, type=int)
+    levels = {x.strip() for x in request.args.get("level", "").split(",") if x.strip()} or None
+    if levels and not levels <= set(LEVELS):
+        return jsonify({"ok": False, "error": f"level ต้องเป็นหนึ่งใน {', '.join(LEVELS)}"}), 400
+    rnd = request.args.get("round", None, type=int)
+    limit = request.args.get("limit", None, type=int)
+    logs, last_seq, gap = bot_service.read_logs(since, levels, rnd, limit)
     return jsonify({
-        "logs": logs[offset:],
-        "total": len(logs),
-        "running": bot_service.bot_status.get("running", False),
-        "completed": bot_service.bot_status.get("completed", 0),
-        "total_rounds": bot_service.bot_status.get("total", 0),
-        "paused": bot_service.bot_status.get("paused", False),
-        "pending_inputs": bot_service.bot_status.get("pending_inputs", []),
+        "logs": logs,
+        "last_seq": last_seq,
+        "gap": gap,
+        **_progress(),
     })
 
 
+def _progress():
+    st = bot_service.get_status()
+    return {
+        "running": st.get("running", False),
+        "completed": st.get("completed", 0),
+        "total_rounds": st.get("total", 0),
+        "paused": st.get("paused", False),
+        "pending_inputs": st.get("pending_inputs", []),
+        "error": st.get("error"),
+    }
+
+
+def _sse(event, data, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+SSE_HEARTBEAT = 15
+
+
+@app.route("/api/bot/stream")
+@login_required
+def api_bot_stream():
+    """Server-Sent Events: `log` (id = seq ของ log) และ `status` ทุกครั้งที่เปลี่ยน
+
+    ต่อใหม่แล้วอ่านต่อจาก Last-Event-ID (หรือ ?since=) ได้ — ระหว่างเงียบจะส่ง
+    comment เป็น heartbeat ทุก SSE_HEARTBEAT วินาที
+    หมายเหตุ: หนึ่ง stream ถือหนึ่ง thread ไว้ตลอดการเชื่อมต่อ — รันด้วย gthread worker
+    (gunicorn.conf.py) ถ้า stream ใช้ไม่ได้ dashboard จะ poll /api/bot/logs แทน
+    """
+    try:
+        since = int(request.headers.get("Last-Event-ID") or request.args.get("since", 0))
+    except ValueError:
+        since = 0
+
+    def generate(since):
+        version = None
+        yield "retry: 2000\n\n"
+        while True:
+            # อ่าน version ก่อน log — log ที่เขียนก่อน set_status(running=False) จะถูกส่ง
+            # ก่อน status นั้นเสมอ (dashboard ปิด stream ทันทีที่เห็น running=false)
+            v = bot_service.status_version()
+            logs, since, _ = bot_service.read_logs(since)
+            for ev in logs:
+                yield _sse("log", ev, ev["seq"])
+            if v != version:
+                version = v
+                yield _sse("status", _progress())
+            if not bot_service.wait_for_change(since, version, timeout=SSE_HEARTBEAT):
+                yield ": heartbeat\n\n"
+
+    return Response(stream_with_context(generate(since)), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 # ==========================================
 # Run
 # ==========================================
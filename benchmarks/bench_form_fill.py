@@ -0,0 +1,149 @@
+"""Benchmark: scan_and_learn + replay_sequence กับฟอร์มจำลอง (mock_form.py) ใน Chrome
+
+เปิด mock form server ในเครื่อง แล้วให้ SmartRandomBot เรียนรู้ 1 รอบ + replay
+ตามจำนวนรอบ บน headless Chrome จริง รายงานเวลาต่อหน้า (p50/p95/max จาก span
+page.learn / page.replay ใน metrics) เวลาต่อรอบ และจำนวนคำสั่ง WebDriver ต่อรอบ
+ข้อเขียนตอนเรียนรู้ตอบให้อัตโนมัติ — ต้องมี Chrome + chromedriver
+
+    python benchmarks/bench_form_fill.py --pages 3 --questions 8 --rounds 5 --json out.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bot_service
+from mock_form import KINDS, create_app, serve_in_thread
+
+
+def auto_answer(stop):
+    """ตอบข้อเขียนทุกข้อที่บอทถามระหว่างรอบเรียนรู้"""
+    while not stop.is_set():
+        st = bot_service.get_status()
+        if st.get("paused"):
+            answers = {f"{p['q_idx']}_{p['t_idx']}": {
+                "choices": [f"คำตอบ {k + 1}" for k in range(3)], "is_linked": False}
+                for p in st.get("pending_inputs") or []}
+            bot_service.submit_text_answers(answers)
+        stop.wait(0.02)
+
+
+def pct(vals, q):
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(q * len(vals)))] if vals else 0.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pages", type=int, default=3)
+    ap.add_argument("--questions", type=int, default=6, help="จำนวนคำถามต่อหน้า")
+    ap.add_argument("--kinds", default=",".join(KINDS))
+    ap.add_argument("--rounds", type=int, default=5, help="จำนวนรอบ replay (ไม่นับรอบเรียนรู้)")
+    ap.add_argument("--mode", default="random", choices=["random", "fixed", "mix"])
+    ap.add_argument("--delay", type=float, default=0.0, help="หน่วง server ต่อหน้า (วินาที)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--headed", action="store_true", help="เปิด Chrome แบบเห็นหน้าจอ")
+    ap.add_argument("--json", help="บันทึกผลเป็น JSON (ไว้เทียบ regression)")
+    ap.add_argument("--verbose", action="store_true", help="พิมพ์ log ของบอทตอนจบ")
+    args = ap.parse_args()
+
+    app = create_app(args.pages, args.questions, tuple(args.kinds.split(",")),
+                     delay=args.delay, seed=args.seed)
+    server, url = serve_in_thread(app)
+    stats = app.config["MOCK_STATS"]
+
+    bot = bot_service.SmartRandomBot({
+        "url": url, "mode": args.mode, "speed_mode": "fast", "rounds": args.rounds + 1,
+        "seed": args.seed, "headless": not args.headed, "use_schema_cache": False,
+    })
+    metrics = bot_service._metrics
+    metrics.reset()
+    # pause_and_ask รอจนกว่า paused=False หรือ running=False
+    bot_service.set_status(running=True, owner=os.getpid(), paused=False,
+                           pending_inputs=[], answers=None)
+    stop = threading.Event()
+    threading.Thread(target=auto_answer, args=(stop,), daemon=True).start()
+
+    driver = None
+    rounds = []
+    try:
+        t0 = time.perf_counter()
+        try:
+            driver = bot_service.setup_driver(not args.headed)
+        except Exception as e:
+            sys.exit(f"❌ เปิด Chrome ไม่ได้ ({type(e).__name__}: {e}) — ต้องมี Chrome + chromedriver")
+        driver_secs = time.perf_counter() - t0
+        metrics.instrument(driver)
+
+        metrics.round = 1
+        t0 = time.perf_counter()
+        bot.open_form(driver)
+        bot.scan_and_learn(driver)
+        learn_secs = time.perf_counter() - t0
+        learn_ok = stats["submissions"] == 1
+
+        for r in range(2, args.rounds + 2):
+            metrics.round = r
+            t0 = time.perf_counter()
+            bot.open_form(driver)
+            bot.replay_sequence(driver)
+            ok = bot.waiter.confirmation(driver)
+            rounds.append({"round": r, "seconds": time.perf_counter() - t0, "ok": ok})
+    finally:
+        stop.set()
+        bot_service.set_status(running=False)
+        if driver:
+            driver.quit()
+        server.shutdown()
+
+    snap = metrics.snapshot()
+    for rd in rounds:
+        rd["webdriver_calls"] = snap["webdriver_calls"].get(str(rd["round"]), {}).get("total", 0)
+    secs = [rd["seconds"] for rd in rounds]
+    result = {
+        "config": vars(args),
+        "driver_start": driver_secs,
+        "learn": {"seconds": learn_secs, "ok": learn_ok,
+                  "webdriver_calls": snap["webdriver_calls"].get("1", {}).get("total", 0)},
+        "rounds": rounds,
+        "round_p50": pct(secs, 0.50), "round_p95": pct(secs, 0.95),
+        "round_max": max(secs, default=0.0),
+        "submissions": stats["submissions"],
+        "spans": snap["spans"],
+        "counters": snap["counters"],
+    }
+
+    print(f"form             : {args.pages} หน้า x {args.questions} ข้อ ({args.kinds})")
+    print(f"driver start     : {driver_secs:.2f} s")
+    print(f"learn round      : {learn_secs:.2f} s ({result['learn']['webdriver_calls']} WebDriver calls)"
+          f"{'' if learn_ok else '  ❌ ไม่ถึงหน้ายืนยัน'}")
+    for name in ("page.learn", "page.replay"):
+        s = snap["spans"].get(name)
+        if s:
+            print(f"{name:<17}: p50 {s['p50'] * 1e3:7.1f} ms | p95 {s['p95'] * 1e3:7.1f} ms | "
+                  f"max {s['max'] * 1e3:7.1f} ms ({s['count']} หน้า)")
+    if rounds:
+        calls = statistics.median(rd["webdriver_calls"] for rd in rounds)
+        print(f"replay round     : p50 {result['round_p50']:.2f} s | p95 {result['round_p95']:.2f} s | "
+              f"max {result['round_max']:.2f} s | {calls:.0f} WebDriver calls (median)")
+    print(f"submissions      : {stats['submissions']} / {args.rounds + 1} "
+          f"(replay สำเร็จ {sum(rd['ok'] for rd in rounds)}/{len(rounds)})")
+    if snap["counters"]:
+        print("counters         : " + ", ".join(f"{k}={v}" for k, v in sorted(snap["counters"].items())))
+
+    if args.verbose:
+        for e in bot_service.read_logs(0)[0]:
+            print("   ", e["msg"])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
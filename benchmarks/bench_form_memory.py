@@ -0,0 +1,46 @@
+"""Microbenchmark: หา text input ใน memory แบบเดิม (ไล่ list of dict) เทียบกับ PageRecord
+
+    python benchmarks/bench_form_memory.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from form_memory import PageRecord
+
+
+def make_inputs(n_questions):
+    inputs = []
+    for q in range(n_questions):
+        inputs.append({"type": "radio", "q": q, "r": q % 4, "val": f"opt{q % 4}"})
+        inputs.append({"type": "text", "q": q, "t": 0, "val": f"ans{q}",
+                       "options_list": ["a", "b", "c"], "is_linked": False})
+    return inputs
+
+
+def lookup_linear(inputs, n_questions):
+    for q in range(n_questions):
+        next((x for x in inputs
+              if x.get("type") == "text" and x.get("q") == q and x.get("t") == 0), None)
+
+
+def lookup_indexed(page, n_questions):
+    for q in range(n_questions):
+        page.text(q, 0)
+
+
+def main():
+    print(f"{'questions':>10} {'list-of-dict':>14} {'PageRecord':>12} {'speedup':>8}")
+    for n in (10, 50, 100, 300, 1000):
+        inputs = make_inputs(n)
+        page = PageRecord.compile(1, "next", inputs)
+        reps = max(1, 2000 // n)
+        t_lin = min(timeit.repeat(lambda: lookup_linear(inputs, n), number=reps, repeat=3)) / reps
+        t_idx = min(timeit.repeat(lambda: lookup_indexed(page, n), number=reps, repeat=3)) / reps
+        print(f"{n:>10} {t_lin * 1e3:>11.3f} ms {t_idx * 1e3:>9.3f} ms {t_lin / t_idx:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
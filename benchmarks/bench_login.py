@@ -0,0 +1,64 @@
+"""Benchmark: เวลาต่อการ login กับ users.xlsx ขนาด 10k แถว
+
+เทียบ load_users() แบบเดิม (อ่าน Excel ใหม่ทุกครั้ง) กับ CredentialStore
+(อ่านครั้งเดียว, reload เมื่อ mtime เปลี่ยน)
+
+    python benchmarks/bench_login.py [จำนวน user]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import openpyxl
+
+from credentials import CredentialStore, read_users_file
+
+
+def make_users_file(path, n):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["username", "password"])
+    for i in range(n):
+        ws.append([f"user{i}", 100000 + i])
+    wb.save(path)
+
+
+def legacy_login(path, username, password):
+    users = read_users_file(path)      # เดิมอ่านไฟล์ใหม่ทุกครั้งที่ POST /login
+    return username in users and users[username] == password
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "users.xlsx")
+        make_users_file(path, n)
+
+        attempts = 5
+        t0 = time.perf_counter()
+        for i in range(attempts):
+            assert legacy_login(path, f"user{i}", str(100000 + i))
+        legacy = (time.perf_counter() - t0) / attempts
+
+        store = CredentialStore(path)
+        t0 = time.perf_counter()
+        len(store)
+        first = time.perf_counter() - t0
+
+        attempts = 10000
+        t0 = time.perf_counter()
+        for i in range(attempts):
+            assert store.verify(f"user{i % n}", str(100000 + i % n))
+        warm = (time.perf_counter() - t0) / attempts
+
+        print(f"users: {n}")
+        print(f"legacy load_users per login : {legacy * 1e3:9.2f} ms")
+        print(f"CredentialStore first load  : {first * 1e3:9.2f} ms")
+        print(f"CredentialStore per login   : {warm * 1e6:9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
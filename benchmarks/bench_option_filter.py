@@ -0,0 +1,64 @@
+"""Benchmark: กรองตัวเลือกด้วยคำต้องห้ามจำนวนมาก — ลูปเดิมเทียบกับ OptionFilter
+
+    python benchmarks/bench_option_filter.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from option_filter import OptionFilter
+
+
+def legacy_classify(raw, forbidden_words):
+    clean = "".join(raw.split())
+    if "อื่นๆ" in clean or "other" in clean.lower():
+        return "other"
+    for bad in forbidden_words:
+        if bad in clean or bad.lower() in clean.lower():
+            return "forbidden"
+    return None
+
+
+def make_words(n, rng):
+    words = set()
+    while len(words) < n:
+        w = "".join(rng.choice("abcdefghijklmnopqrstuvwxyzกขคงจฉชซ") for _ in range(rng.randint(4, 10)))
+        words.add(w)
+        words.add(w.upper())     # api_bot_start เก็บทั้งสองแบบ
+    return list(words)
+
+
+def main():
+    rng = random.Random(1)
+    labels = [f"ตัวเลือก ที่ {i} ระดับ {i % 5}" for i in range(40)]
+    options = [rng.choice(labels) for _ in range(20000)]
+    print(f"{'words':>6} {'legacy opt/s':>14} {'matcher opt/s':>14} {'cold opt/s':>12}")
+    for n in (100, 1000, 5000):
+        words = make_words(n, rng)
+
+        t0 = time.perf_counter()
+        legacy = [legacy_classify(o, words) for o in options[:2000]]
+        t_legacy = (time.perf_counter() - t0) / 2000
+
+        flt = OptionFilter(words)
+        t0 = time.perf_counter()
+        fast = [flt.classify(o) for o in options]
+        t_fast = (time.perf_counter() - t0) / len(options)
+        assert fast[:2000] == legacy
+
+        # ไม่มี cache hit — label ไม่ซ้ำเลย
+        uniq = [f"{o} #{i}" for i, o in enumerate(options[:5000])]
+        flt = OptionFilter(words)
+        t0 = time.perf_counter()
+        for o in uniq:
+            flt.classify(o)
+        t_cold = (time.perf_counter() - t0) / len(uniq)
+
+        print(f"{len(words):>6} {1 / t_legacy:>14,.0f} {1 / t_fast:>14,.0f} {1 / t_cold:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark: เวลา import app.py และ RSS ของ process ตอน cold start
+
+รันแต่ละรอบใน subprocess ใหม่ (ไม่มี module cache) แล้วรายงาน median
+พร้อมบอกว่า module หนัก ๆ ตัวไหนถูกโหลดไปแล้วบ้างหลัง import
+
+    python benchmarks/bench_startup.py [รอบ]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+HEAVY = ("selenium", "webdriver_manager", "openpyxl", "pandas")
+
+_PROBE = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+import app
+dt = time.perf_counter() - t0
+print(json.dumps({
+    "seconds": dt,
+    "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY,)
+
+
+def probe():
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    results = [probe() for _ in range(runs)]
+    print(f"runs          : {runs}")
+    print(f"import app    : {statistics.median(r['seconds'] for r in results) * 1e3:.1f} ms (median)")
+    print(f"max RSS       : {statistics.median(r['rss_kb'] for r in results) / 1024:.1f} MiB (median)")
+    print(f"heavy modules : {', '.join(results[-1]['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""ฟอร์มจำลองแบบ Google Form สำหรับทดสอบ / benchmark บอทแบบ offline
+
+markup เหมือนที่บอทอ่าน: div[role="listitem"] + heading, radiogroup/radio,
+checkbox, listbox (มี option placeholder "เลือก" data-value="" ค้างไว้เหมือนฟอร์มจริง) →
+div[role="option"], input text, ปุ่ม div[role="button"]
+ถัดไป/ส่ง และหน้ายืนยันที่มีข้อความตรงกับ CONFIRM_XPATH ใน page_wait.py
+
+แต่ละหน้าเป็น document ใหม่ (POST /form/<n>) เหมือนฟอร์มจริงที่เปลี่ยนหน้า
+ชนิดคำถามวนตาม kinds และสุ่มจำนวนตัวเลือกแบบกำหนด seed ได้ — ฟอร์มเดิมทุกครั้ง
+
+    python benchmarks/mock_form.py --pages 3 --questions 6 --port 5055
+"""
+import argparse
+import html
+import json
+import random
+import threading
+import time
+
+from flask import Flask, jsonify
+
+KINDS = ("radio", "checkbox", "dropdown", "matrix", "text")
+CONFIRM_TEXT = "ระบบบันทึกคำตอบของคุณแล้ว"
+
+_SCRIPT = r"""
+<script>
+const closePopup = () => document.querySelectorAll(".mock-popup").forEach(p => p.remove());
+document.addEventListener("click", ev => {
+  const radio = ev.target.closest('div[role="radio"]');
+  if (radio) {
+    radio.closest('div[role="radiogroup"]').querySelectorAll('div[role="radio"]')
+      .forEach(r => r.setAttribute("aria-checked", r === radio ? "true" : "false"));
+    return;
+  }
+  const cb = ev.target.closest('div[role="checkbox"]');
+  if (cb) {
+    cb.setAttribute("aria-checked", cb.getAttribute("aria-checked") === "true" ? "false" : "true");
+    return;
+  }
+  const opt = ev.target.closest('div[role="option"]');
+  if (opt && opt.dataset.owner) {
+    const lb = document.getElementById(opt.dataset.owner);
+    lb.querySelector("span").textContent = opt.textContent;
+    lb.setAttribute("aria-expanded", "false");
+    closePopup();
+    return;
+  }
+  const lb = ev.target.closest('div[role="listbox"]');
+  if (lb) {
+    closePopup();
+    const pop = document.createElement("div");
+    pop.className = "mock-popup";
+    JSON.parse(lb.dataset.options).forEach(t => {
+      const o = document.createElement("div");
+      o.setAttribute("role", "option");
+      o.setAttribute("data-value", t);
+      o.setAttribute("aria-selected", "false");
+      o.dataset.owner = lb.id;
+      o.textContent = t;
+      pop.appendChild(o);
+    });
+    lb.after(pop);
+    lb.setAttribute("aria-expanded", "true");
+    return;
+  }
+  const btn = ev.target.closest('div[role="button"]');
+  if (btn && btn.dataset.target) {
+    const f = document.getElementById("nav");
+    f.action = btn.dataset.target;
+    f.submit();
+  }
+});
+document.addEventListener("keydown", ev => { if (ev.key === "Escape") closePopup(); });
+</script>
+"""
+
+_STYLE = """
+<style>
+body { font-family: sans-serif; max-width: 720px; margin: 2em auto; }
+div[role="listitem"] { border: 1px solid #ddd; border-radius: 8px; padding: 1em; margin: 1em 0; }
+div[role="heading"] { font-weight: bold; margin-bottom: .5em; }
+div[role="radio"], div[role="checkbox"], div[role="option"] { padding: .25em; cursor: pointer; }
+div[role="radio"][aria-checked="true"], div[role="checkbox"][aria-checked="true"] { background: #e8f0fe; }
+div[role="listbox"] { border: 1px solid #aaa; padding: .4em; display: inline-block; cursor: pointer; }
+.mock-popup { border: 1px solid #aaa; background: #fff; width: 240px; }
+div[role="button"] { display: inline-block; padding: .5em 1.5em; background: #673ab7; color: #fff;
+                     border-radius: 4px; cursor: pointer; margin-right: .5em; }
+</style>
+"""
+
+
+def build_form(pages=3, questions=5, kinds=KINDS, options=(3, 6), seed=0):
+    """list ของหน้า แต่ละหน้าเป็น list[(kind, title, choices, rows)]"""
+    rng = random.Random(seed)
+    form, n = [], 0
+    for p in range(pages):
+        page = []
+        for i in range(questions):
+            kind = kinds[n % len(kinds)]
+            n += 1
+            choices = [f"ตัวเลือก {k + 1}" for k in range(rng.randint(*options))]
+            rows = [f"แถว {r + 1}" for r in range(rng.randint(2, 4))] if kind == "matrix" else []
+            page.append((kind, f"คำถามที่ {n} ({kind})", choices, rows))
+        form.append(page)
+    return form
+
+
+def _choice(role, text):
+    t = html.escape(text)
+    return (f'<div role="{role}" aria-checked="false" data-value="{t}" '
+            f'aria-label="{t}"><span>{t}</span></div>')
+
+
+def render_question(qid, kind, title, choices, rows):
+    body = []
+    if kind == "radio":
+        body.append('<div role="radiogroup">' + "".join(_choice("radio", c) for c in choices) + "</div>")
+    elif kind == "matrix":
+        for r in rows:
+            body.append(f'<div role="radiogroup" aria-label="{html.escape(r)}">{html.escape(r)}'
+                        + "".join(_choice("radio", c) for c in choices) + "</div>")
+    elif kind == "checkbox":
+        body.extend(_choice("checkbox", c) for c in choices)
+    elif kind == "dropdown":
+        opts = html.escape(json.dumps(choices, ensure_ascii=False))
+        body.append(f'<div role="listbox" id="lb-{qid}" aria-expanded="false" '
+                    f'data-options="{opts}"><div role="option" data-value="" aria-selected="true">'
+                    '<span>เลือก</span></div></div>')
+    elif kind == "text":
+        body.append('<input type="text" aria-label="คำตอบของคุณ" autocomplete="off">')
+    return (f'<div role="listitem"><div role="heading">{html.escape(title)}</div>'
+            + "".join(body) + "</div>")
+
+
+def render_page(form, page_no):
+    page = form[page_no - 1]
+    items = "".join(render_question(f"{page_no}-{i}", *q) for i, q in enumerate(page))
+    last = page_no == len(form)
+    if last:
+        btn = '<div role="button" data-target="/form/done"><span>ส่ง</span></div>'
+    else:
+        btn = f'<div role="button" data-target="/form/{page_no + 1}"><span>ถัดไป</span></div>'
+    return (f"<!doctype html><html><head><meta charset='utf-8'><title>Mock form {page_no}</title>"
+            f"{_STYLE}</head><body><h1>ฟอร์มจำลอง — หน้า {page_no}/{len(form)}</h1>"
+            f"{items}<form id='nav' method='post'></form>{btn}{_SCRIPT}</body></html>")
+
+
+def create_app(pages=3, questions=5, kinds=KINDS, confirm_text=CONFIRM_TEXT,
+               delay=0.0, seed=0):
+    """delay = หน่วงก่อนตอบทุกหน้า (วินาที) จำลอง server ช้า"""
+    app = Flask(__name__)
+    form = build_form(pages, questions, kinds, seed=seed)
+    stats = {"views": 0, "submissions": 0}
+    lock = threading.Lock()
+
+    def slow():
+        if delay:
+            time.sleep(delay)
+
+    @app.route("/form", methods=["GET"])
+    @app.route("/form/<int:page_no>", methods=["GET", "POST"])
+    def page(page_no=1):
+        if not 1 <= page_no <= len(form):
+            return "ไม่พบหน้า", 404
+        slow()
+        with lock:
+            stats["views"] += 1
+        return render_page(form, page_no)
+
+    @app.route("/form/done", methods=["POST"])
+    def done():
+        slow()
+        with lock:
+            stats["submissions"] += 1
+        return (f"<!doctype html><html><head><meta charset='utf-8'></head><body>"
+                f"<div>{html.escape(confirm_text)}</div>"
+                f"<a href='/form'>ส่งคำตอบเพิ่ม</a></body></html>")
+
+    @app.route("/stats")
+    def get_stats():
+        with lock:
+            return jsonify(dict(stats))
+
+    app.config["MOCK_FORM"] = form
+    app.config["MOCK_STATS"] = stats
+    return app
+
+
+def serve_in_thread(app, host="127.0.0.1", port=0):
+    """เปิด server ใน thread พื้นหลัง — คืน (server, url ของหน้าแรก)"""
+    from werkzeug.serving import make_server
+    server = make_server(host, port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/form"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pages", type=int, default=3)
+    ap.add_argument("--questions", type=int, default=5, help="จำนวนคำถามต่อหน้า")
+    ap.add_argument("--kinds", default=",".join(KINDS), help="ชนิดคำถาม คั่นด้วย ,")
+    ap.add_argument("--confirm-text", default=CONFIRM_TEXT)
+    ap.add_argument("--delay", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--port", type=int, default=5055)
+    args = ap.parse_args()
+    app = create_app(args.pages, args.questions, tuple(args.kinds.split(",")),
+                     args.confirm_text, args.delay, args.seed)
+    app.run(port=args.port)
+
+
+if __name__ == "__main__":
+    main()
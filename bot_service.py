@@ -1,38 +1,96 @@
+import os
+import atexit
 import time
 import random
 import threading
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-bot_status = {
-    "running": False,
-    "logs": [],
-    "completed": 0,
-    "total": 0,
-    "error": None,
-    "paused": False,
-    "pending_inputs": [],
-    "answers": None,
-}
-
-_resume_event = threading.Event()
-_resume_event.set()
-
-
-def log(msg):
-    bot_status["logs"].append(msg)
-    if len(bot_status["logs"]) > 500:
-        bot_status["logs"] = bot_status["logs"][-300:]
+from contextlib import contextmanager
+
+# Selenium ถูก import ในฟังก์ชันที่ใช้เท่านั้น — app.py import โมดูลนี้ได้โดยไม่ต้องโหลด
+# Selenium จนกว่าจะมีงานเริ่มจริง (ช่วยให้ gunicorn worker boot เร็วขึ้น)
+from form_snapshot import snapshot_form, snapshot_buttons, find_button, PageModel
+from form_memory import PageRecord
+from option_filter import OptionFilter
+from sampling import WeightedSampler
+from page_wait import PageWaiter
+from interaction import Clicker
+from schema_cache import SchemaCache, structure_hash, DEFAULT_DIR as SCHEMA_CACHE_DIR
+from driver_pool import DriverPool, resolve_chromedriver
+from state_backend import make_backend
+from metrics import Metrics
+from profiling import RunProfiler, DEFAULT_DIR as PROFILE_DIR
+from run_report import RunReport, RoundRecord, DEFAULT_DIR as REPORT_DIR
+
+# status + log อยู่ใน backend ที่เลือกด้วย BOT_STATE_BACKEND (memory / sqlite)
+# pause/resume และ stop ก็ส่งผ่าน status (paused / answers / running) ทำให้ทุก worker สั่งงานได้
+bot_status, _logs = make_backend(dict(
+    running=False,
+    owner=None,
+    completed=0,
+    total=0,
+    error=None,
+    paused=False,
+    pending_inputs=[],
+    answers=None,
+    driver=None,
+    driver_starts={},
+    metrics={},
+    profile=None,
+    report=None,
+), maxlen=500)
+
+# เวลาแต่ละช่วง + จำนวนคำสั่ง WebDriver ต่อรอบ ของงานที่รันใน process นี้
+# (worker อื่นเห็นผ่าน status["metrics"] ที่ publish ทุกจบรอบ)
+_metrics = Metrics()
+
+NEXT_LABELS = ["ถัดไป", "Next", "ต่อไป"]
+SUBMIT_LABELS = ["ส่ง", "Submit", "Send"]
+
+
+class SchemaMismatch(Exception):
+    """หน้าที่เปิดอยู่มีโครงสร้างไม่ตรงกับ schema ที่โหลดมาจาก cache"""
+
+
+def log(msg, level="info"):
+    _logs.append(msg, level)
+    bot_status.notify()   # ปลุก SSE stream
+
+
+def set_status(**fields):
+    bot_status.update(**fields)
+
+
+def status_version():
+    return bot_status.version
+
+
+def wait_for_change(log_seq, version, timeout=None):
+    """บล็อกจนมี log seq > log_seq หรือ status version เปลี่ยน — คืน False ถ้า timeout"""
+    return bot_status.wait_for(
+        lambda: _logs.last_seq > log_seq or bot_status.version != version, timeout)
+
+
+def read_logs(since=0, levels=None, round=None, limit=None):
+    events, last, gap = _logs.read(since, levels, round, limit)
+    return [e.to_dict() for e in events], last, gap
+
+
+def publish_metrics():
+    set_status(metrics=_metrics.snapshot())
+
+
+def get_metrics():
+    """metrics สด ถ้างานอยู่ใน process นี้ ไม่งั้นใช้ค่าที่ publish ไว้ล่าสุด"""
+    if bot_status.get("owner") == os.getpid():
+        return _metrics.snapshot()
+    return dict(bot_status.get("metrics") or {})
 
 
 def setup_driver(headless=True):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.common.exceptions import WebDriverException
+
     opts = Options()
     if headless:
         opts.add_argument("--headless=new")
@@ -46,42 +104,40 @@ def setup_driver(headless=True):
     opts.add_experimental_option('excludeSwitches', ['enable-logging', 'enable-automation'])
     opts.add_experimental_option('useAutomationExtension', False)
     opts.page_load_strategy = 'eager'
-    svc = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=svc, options=opts)
+    path, _, cached = resolve_chromedriver()
+    try:
+        driver = webdriver.Chrome(service=Service(path), options=opts)
+    except (WebDriverException, OSError) as e:
+        if not cached:
+            raise
+        # Chrome อัปเดตแล้ว chromedriver ที่ cache ไว้ไม่ตรงรุ่น — หาใหม่หนึ่งครั้ง
+        log(f"⚠️ chromedriver ที่ cache ไว้ใช้ไม่ได้ ({type(e).__name__}) — กำลังหาใหม่", "warn")
+        path = resolve_chromedriver(refresh=True)[0]
+        driver = webdriver.Chrome(service=Service(path), options=opts)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     return driver
 
 
-def scroll_to(driver, el):
-    try:
-        driver.execute_script("arguments[0].scrollIntoView({block:'center',behavior:'instant'});", el)
-        time.sleep(0.1)
-        return True
-    except:
-        return False
+# เรียกผ่าน lambda เพื่อให้ setup_driver ที่ถูกแทนที่ภายหลังมีผล
+_driver_pool = DriverPool(lambda headless: setup_driver(headless))
+# browser ที่อุ่นไว้ (keep_warm) ปิดพร้อม process — ไม่ทิ้ง Chrome / chromedriver ค้างตอน worker ถูก recycle
+atexit.register(_driver_pool.shutdown)
 
 
-def quick_type(el, text):
-    try:
-        el.clear()
-        el.send_keys(str(text))
-        return True
-    except:
-        return False
+def press_escape(driver):
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.common.action_chains import ActionChains
+    ActionChains(driver).send_keys(Keys.ESCAPE).perform()
 
 
-def safe_click(driver, el):
-    for _ in range(3):
+def quick_type(el, text):
+    with _metrics.span("fill.text"):
         try:
-            el.click()
+            el.clear()
+            el.send_keys(str(text))
             return True
         except:
-            try:
-                driver.execute_script("arguments[0].click();", el)
-                return True
-            except:
-                time.sleep(0.1)
-    return False
+            return False
 
 
 class SmartRandomBot:
@@ -91,91 +147,129 @@ class SmartRandomBot:
         self.speed_mode = config.get("speed_mode", "fast")
         self.rounds = int(config.get("rounds", 1))
         self.forbidden_words = config.get("forbidden_words", [])
+        self.option_filter = OptionFilter(self.forbidden_words)
         self.weight_map = {int(k): v for k, v in config.get("weight_map", {}).items()}
         self.dist_mode = int(config.get("dist_mode", 1))
         self.manual_pages = config.get("manual_pages", [])
         self.headless = config.get("headless", True)
-        self.memory = []
+        self.keep_warm = config.get("keep_warm", False)
+        self.profile = bool(config.get("profile", False))
+        self.sampler = WeightedSampler(self.weight_map, self.dist_mode, config.get("seed"))
+        self.rng = self.sampler.rng
+        self.waiter = PageWaiter(
+            page_timeout=float(config.get("page_timeout", 10)),
+            confirm_timeout=float(config.get("confirm_timeout", 5)),
+            metrics=_metrics,
+        )
+        self.clicker = Clicker(_metrics)   # จำ native/JS click ต่อชนิด element ของฟอร์มนี้
+        self.use_schema_cache = config.get("use_schema_cache", True)
+        self.schema_cache = SchemaCache(config.get("schema_cache_dir") or SCHEMA_CACHE_DIR)
+        self.verify_structure = False   # True = memory มาจาก cache ยังไม่ได้เทียบกับฟอร์มจริง
+        self.memory = []              # list[PageRecord]
+        self.report_dir = config.get("report_dir") or REPORT_DIR
+        self.report = None
+        self._round = None            # RoundRecord ของรอบที่กำลังทำ
+        self._retry_base = {}
+        self._page = 0
         self.master_random_index = 0
         self.page_logic_buffer = {}
 
-    def safe_click_dropdown(self, driver, el):
+    def pace(self, human, fast=0):
+        """หน่วงเวลาโดยตั้งใจ (นโยบาย speed_mode) — แยกจากการรอหน้าโหลดใน self.waiter"""
+        d = human if self.speed_mode == "human" else fast
+        if d:
+            time.sleep(d)
+
+    # ---------- report รายรอบ ----------
+    def _begin_round(self, n, kind):
+        self._round = RoundRecord(n, kind, time.time())
+        self._retry_base = _metrics.counters()
+
+    def _end_round(self, ok, failure=None):
+        rec, self._round = self._round, None
+        if rec is None:
+            return
+        rec.ended, rec.ok, rec.failure = time.time(), ok, failure
+        now = _metrics.counters()
+        rec.retries = {k: v - self._retry_base.get(k, 0) for k, v in now.items()
+                       if k.startswith("safe_click.") and v != self._retry_base.get(k, 0)}
+        if self.report is None:
+            return
         try:
-            scroll_to(driver, el)
-            try:
-                el.click()
-            except:
-                driver.execute_script("arguments[0].click();", el)
-            WebDriverWait(driver, 3).until(
-                EC.visibility_of_element_located((By.CSS_SELECTOR, 'div[role="option"]')))
-            return True
-        except:
-            return False
+            self.report.append(rec)
+        except OSError as e:
+            log(f"⚠️ บันทึก report ไม่สำเร็จ: {e}", "warn")
+
+    def _answer(self, q_idx, kind, value):
+        if self._round is not None:
+            self._round.answers.append(
+                {"page": self._page, "q": q_idx, "kind": kind, "value": value})
+
+    def _record_page(self, span, page, t0):
+        secs = time.perf_counter() - t0
+        _metrics.observe(span, secs)
+        if self._round is not None:
+            self._round.pages.append({"page": page, "seconds": round(secs, 3)})
+
+    @contextmanager
+    def _page_span(self, span, page):
+        self._page = page
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_page(span, page, t0)
 
-    def smart_select(self, elements, is_matrix_row=False):
-        if not elements:
+    def open_form(self, driver):
+        with _metrics.span("driver.get"):
+            driver.get(self.url)
+        if not self.waiter.form_ready(driver):
+            log(f"⚠️ ฟอร์มยังไม่พร้อมภายใน {self.waiter.page_timeout:g} วินาที", "warn")
+        self.pace(1.5)
+
+    def click_and_wait(self, driver, btn):
+        """กดปุ่ม ถัดไป/ส่ง แล้วรอจนหน้าใหม่ render เสร็จ"""
+        token = self.waiter.mark(driver)
+        self.clicker.click(driver, btn, "button")
+        if not self.waiter.page_change(driver, token):
+            log(f"⚠️ หน้าไม่เปลี่ยนภายใน {self.waiter.page_timeout:g} วินาที", "warn")
+
+    def smart_select(self, options, is_matrix_row=False):
+        """options = list[Choice] จาก snapshot — ไม่ต้องถาม WebDriver ซ้ำ"""
+        if not options:
             return None
-        total = len(elements)
+        total = len(options)
         valid_opts, valid_idx = [], []
-        for i, el in enumerate(elements):
-            try:
-                dv = el.get_attribute("data-value")
-                if dv == "__other_option__":
-                    continue
-                raw = el.get_attribute("aria-label") or el.text or dv or ""
-                clean = "".join(raw.split())
-                if "อื่นๆ" in clean or "other" in clean.lower():
-                    continue
-                forbidden = False
-                for bad in self.forbidden_words:
-                    if bad in clean or bad.lower() in clean.lower():
-                        log(f"🚫 ข้าม: {raw.strip()}")
-                        forbidden = True
-                        break
-                if not forbidden:
-                    valid_opts.append(el)
-                    valid_idx.append(i)
-            except:
+        for i, opt in enumerate(options):
+            if opt.value == "__other_option__":
                 continue
+            raw = opt.caption
+            verdict = self.option_filter.classify(raw)
+            if verdict == "forbidden":
+                log(f"🚫 ข้าม: {raw.strip()}", "debug")
+            elif verdict is None:
+                valid_opts.append(opt)
+                valid_idx.append(i)
         if not valid_opts:
             return None
-        if total in self.weight_map:
-            ws = [self.weight_map[total][i] if i < len(self.weight_map[total]) else 0 for i in valid_idx]
-            if sum(ws) > 0:
-                return random.choices(valid_opts, weights=ws, k=1)[0]
-        if self.dist_mode > 1 and not is_matrix_row:
-            n = len(valid_opts)
-            ws = [1/(i+1) for i in range(n)] if self.dist_mode == 2 else [1/((i+1)**2) for i in range(n)]
-            return random.choices(valid_opts, weights=ws, k=1)[0]
-        return random.choice(valid_opts)
-
-    def scan_text_inputs_on_page(self, driver):
+        return self.sampler.pick(valid_opts, total, valid_idx, is_matrix_row)
+
+    def scan_text_inputs_on_page(self, driver, snap=None):
         found = []
         # has_any_global = มีข้อเขียนที่ตอบไปแล้วในหน้าก่อนหน้า
         has_any_global = len(self.page_logic_buffer) > 0
         try:
-            questions = driver.find_elements(By.CSS_SELECTOR, 'div[role="listitem"]')
-            for q_idx, q in enumerate(questions):
-                inputs = q.find_elements(By.CSS_SELECTOR,
-                    'input[type="text"]:not([type="hidden"]), textarea')
-                for t_idx, t in enumerate(inputs):
-                    lbl = t.get_attribute("aria-label") or ""
-                    if "คำตอบอื่นๆ" in lbl or "Other" in lbl:
+            snap = snap or snapshot_form(driver)
+            for q in snap.questions:
+                for f in q.text_inputs:
+                    if f.is_other or f.value:
                         continue
-                    if t.get_attribute("value"):
-                        continue
-                    title = f"คำถาม #{q_idx + 1}"
-                    try:
-                        h = q.find_element(By.CSS_SELECTOR, 'div[role="heading"]')
-                        title = h.text.replace("\n", " ").strip()[:80]
-                    except:
-                        pass
                     # has_previous = มีข้อเขียนก่อนหน้าไม่ว่าจะหน้าไหน
                     has_previous = has_any_global or len(found) > 0
                     found.append({
-                        "q_idx": q_idx,
-                        "t_idx": t_idx,
-                        "title": title,
+                        "q_idx": q.index,
+                        "t_idx": f.text_index,
+                        "title": q.title(),
                         "has_previous": has_previous,
                     })
         except:
@@ -183,127 +277,108 @@ class SmartRandomBot:
         return found
 
     def pause_and_ask(self, pending_inputs):
-        global _resume_event
-        _resume_event.clear()
-        bot_status["paused"] = True
-        bot_status["pending_inputs"] = pending_inputs
-        bot_status["answers"] = None
+        set_status(paused=True, pending_inputs=pending_inputs, answers=None)
         log(f"⏸️ หยุดรอคำตอบข้อเขียน {len(pending_inputs)} ข้อ...")
-        while not _resume_event.wait(timeout=1):
-            if not bot_status["running"]:
-                return
-
-        bot_status["paused"] = False
-
-    def auto_fill_current_page(self, driver, learn_mode=False, fixed_memory=None):
-        time.sleep(0.5)
+        # submit_text_answers ตั้ง paused=False / stop_bot ตั้ง running=False
+        bot_status.wait_for(lambda: not bot_status.get("paused") or not bot_status.get("running"))
+
+    def _fill_radiogroups(self, driver, q):
+        for group in q.radiogroups:
+            if group and not any(o.checked for o in group):
+                with _metrics.span("fill.radio"):
+                    t = self.smart_select(group, is_matrix_row=len(q.radiogroups) > 1)
+                    if t:
+                        self.clicker.click(driver, t.el, "radio")
+                        self._answer(q.index, "radio", t.caption)
+                if t:
+                    self.pace(0.5, 0.05)
+
+    def _fill_checkboxes(self, driver, q):
+        with _metrics.span("fill.checkbox"):
+            for cb in q.checkboxes:
+                if cb.checked:
+                    self.clicker.click(driver, cb.el, "checkbox")
+                    self.pace(0.3, 0.05)
+            t = self.smart_select(q.checkboxes)
+            if t:
+                self.clicker.click(driver, t.el, "checkbox")
+                self._answer(q.index, "checkbox", t.caption)
+        if t:
+            self.pace(0.5, 0.1)
+
+    def auto_fill_current_page(self, driver, learn_mode=False, fixed_memory=None, snap=None):
+        self.pace(0.5)
         # ไม่ reset page_logic_buffer ที่นี่ — ต้องจำ across pages
         # reset เฉพาะตอนเริ่ม learn round ใหม่ (ใน scan_and_learn)
 
         try:
-            questions = driver.find_elements(By.CSS_SELECTOR, 'div[role="listitem"]')
+            snap = snap or snapshot_form(driver)
 
             # PASS 1 (learn_mode): กรอก radio/checkbox ก่อน แล้วค่อย scan text inputs
             if learn_mode:
-                for q_idx, q in enumerate(questions):
-                    try:
-                        rgs = q.find_elements(By.CSS_SELECTOR, 'div[role="radiogroup"]')
-                        if rgs:
-                            for rg in rgs:
-                                opts = rg.find_elements(By.CSS_SELECTOR, 'div[role="radio"]')
-                                if opts and not any(o.get_attribute("aria-checked") == "true" for o in opts):
-                                    t = self.smart_select(opts, is_matrix_row=len(rgs) > 1)
-                                    if t:
-                                        scroll_to(driver, t)
-                                        safe_click(driver, t)
-                                        time.sleep(0.5 if self.speed_mode == "human" else 0.05)
-                        else:
-                            cbs = q.find_elements(By.CSS_SELECTOR, 'div[role="checkbox"]')
-                            if cbs and len(cbs) > 1:
-                                for cb in cbs:
-                                    if cb.get_attribute("aria-checked") == "true":
-                                        scroll_to(driver, cb)
-                                        safe_click(driver, cb)
-                                        time.sleep(0.3 if self.speed_mode == "human" else 0.05)
-                                t = self.smart_select(cbs)
-                                if t:
-                                    scroll_to(driver, t)
-                                    safe_click(driver, t)
-                                    time.sleep(0.5 if self.speed_mode == "human" else 0.1)
-                    except:
-                        continue
+                model = PageModel(snap)
+                todo = snap.questions
+                for rescan in range(3):
+                    for q in todo:
+                        try:
+                            if q.radiogroups:
+                                self._fill_radiogroups(driver, q)
+                            elif len(q.checkboxes) > 1:
+                                # ข้อที่ DOM เปลี่ยนแต่ติ๊กไว้แล้ว ไม่ต้องสุ่มใหม่
+                                if not rescan or not any(c.checked for c in q.checkboxes):
+                                    self._fill_checkboxes(driver, q)
+                        except:
+                            continue
+                        if not q.text_inputs and not q.listboxes:
+                            model.complete(q)
+                    # snapshot ใหม่เฉพาะข้อที่ยังไม่เสร็จ หรือ DOM เปลี่ยน — ข้อที่โผล่ขึ้นมาใหม่
+                    # หลังเลือกคำตอบ (changed) ต้องกรอก radio/checkbox ด้วย
+                    snap = model.refresh(driver)
+                    todo = [q for q in snap.questions if q.index in model.changed]
+                    if not todo:
+                        break
 
-                # หลัง fill radio/checkbox แล้ว scan text inputs ที่เหลือ
-                pending = self.scan_text_inputs_on_page(driver)
+                # scan ข้อเขียนจาก snapshot นี้ (ระหว่าง pause บอทไม่แตะหน้า → ใช้ต่อใน PASS 2 ได้)
+                pending = self.scan_text_inputs_on_page(driver, snap)
                 if pending:
                     self.pause_and_ask(pending)
                 # PASS 1 เสร็จ — PASS 2 จะ fill text inputs ด้านล่าง
 
-            for q_idx, q in enumerate(questions):
+            for q in snap.questions:
+                q_idx = q.index
                 try:
-                    handled = False
-
-                    radiogroups = q.find_elements(By.CSS_SELECTOR, 'div[role="radiogroup"]')
-                    if radiogroups:
+                    if q.radiogroups:
                         if not learn_mode:  # learn_mode กรอกไปแล้วใน PASS 1
-                            for rg in radiogroups:
-                                opts = rg.find_elements(By.CSS_SELECTOR, 'div[role="radio"]')
-                                if not opts:
-                                    continue
-                                if not any(o.get_attribute("aria-checked") == "true" for o in opts):
-                                    t = self.smart_select(opts, is_matrix_row=len(radiogroups) > 1)
-                                    if t:
-                                        scroll_to(driver, t)
-                                        safe_click(driver, t)
-                                        time.sleep(0.5 if self.speed_mode == "human" else 0.05)
-                        handled = True
-
-                    if not handled:
-                        cbs = q.find_elements(By.CSS_SELECTOR, 'div[role="checkbox"]')
-                        if cbs and len(cbs) > 1:
-                            if not learn_mode:  # learn_mode กรอกไปแล้วใน PASS 1
-                                for cb in cbs:
-                                    if cb.get_attribute("aria-checked") == "true":
-                                        scroll_to(driver, cb)
-                                        safe_click(driver, cb)
-                                        time.sleep(0.3 if self.speed_mode == "human" else 0.05)
-                                t = self.smart_select(cbs)
-                                if t:
-                                    scroll_to(driver, t)
-                                    safe_click(driver, t)
-                                    time.sleep(0.5 if self.speed_mode == "human" else 0.1)
-                            handled = True
-
-                    text_inputs = q.find_elements(By.CSS_SELECTOR,
-                        'input[type="text"]:not([type="hidden"]), textarea')
-                    for t_idx, t_input in enumerate(text_inputs):
-                        lbl = t_input.get_attribute("aria-label") or ""
-                        if "คำตอบอื่นๆ" in lbl or "Other" in lbl:
-                            continue
-                        if t_input.get_attribute("value"):
+                            self._fill_radiogroups(driver, q)
+                    elif len(q.checkboxes) > 1:
+                        if not learn_mode:  # learn_mode กรอกไปแล้วใน PASS 1
+                            self._fill_checkboxes(driver, q)
+
+                    for f in q.text_inputs:
+                        if f.is_other or f.value:
                             continue
+                        t_idx = f.text_index
                         key = f"{q_idx}_{t_idx}"
 
                         if not learn_mode and fixed_memory is not None:
-                            mem = next((x for x in fixed_memory
-                                if x.get("type") == "text"
-                                and x.get("q") == q_idx
-                                and x.get("t") == t_idx), None)
+                            mem = fixed_memory.text(q_idx, t_idx)
                             if mem:
-                                if "options_list" in mem:
-                                    choices = mem["options_list"]
+                                if mem.options_list is not None:
+                                    choices = mem.options_list
                                     if choices:
-                                        if mem.get("is_linked", False):
+                                        if mem.is_linked:
                                             idx = self.master_random_index % len(choices)
                                         else:
-                                            idx = random.randint(0, len(choices) - 1)
+                                            idx = self.rng.randint(0, len(choices) - 1)
                                             self.master_random_index = idx
-                                        scroll_to(driver, t_input)
-                                        quick_type(t_input, choices[idx])
+                                        self.clicker.scroll(driver, f.el)
+                                        quick_type(f.el, choices[idx])
+                                        self._answer(q_idx, "text", choices[idx])
                                         log(f"✍️ [q{q_idx}] → {choices[idx]}")
-                                elif mem.get("val"):
-                                    scroll_to(driver, t_input)
-                                    quick_type(t_input, mem["val"])
+                                elif mem.val:
+                                    self.clicker.scroll(driver, f.el)
+                                    quick_type(f.el, mem.val)
+                                    self._answer(q_idx, "text", mem.val)
                             continue
 
                         if learn_mode:
@@ -316,64 +391,64 @@ class SmartRandomBot:
                                     if is_linked:
                                         idx = self.master_random_index % len(choices)
                                     else:
-                                        idx = random.randint(0, len(choices) - 1)
+                                        idx = self.rng.randint(0, len(choices) - 1)
                                         self.master_random_index = idx
                                     selected = choices[idx]
-                                    scroll_to(driver, t_input)
-                                    quick_type(t_input, selected)
+                                    self.clicker.scroll(driver, f.el)
+                                    quick_type(f.el, selected)
+                                    self._answer(q_idx, "text", selected)
                                     log(f"✍️ [q{q_idx}] → {selected} (pos {idx+1}/{len(choices)})")
                                     self.page_logic_buffer[key] = {
                                         "options_list": choices,
                                         "is_linked": is_linked,
                                     }
                             else:
-                                log(f"⚠️ ข้ามข้อเขียน [q{q_idx}]")
+                                log(f"⚠️ ข้ามข้อเขียน [q{q_idx}]", "warn")
                             continue
 
-                    listboxes = q.find_elements(By.CSS_SELECTOR, 'div[role="listbox"]')
-                    for lb in listboxes:
+                    for lb in q.listboxes:
                         if "เลือก" in (lb.text or ""):
-                            scroll_to(driver, lb)
-                            if self.safe_click_dropdown(driver, lb):
-                                opts = driver.find_elements(By.CSS_SELECTOR, 'div[role="option"]')
-                                t = self.smart_select(opts)
-                                if t:
-                                    safe_click(driver, t)
-                                    time.sleep(0.5 if self.speed_mode == "human" else 0.15)
-                                else:
-                                    ActionChains(driver).send_keys(Keys.ESCAPE).perform()
+                            with _metrics.span("fill.dropdown"):
+                                t = None
+                                opts = self.clicker.open_dropdown(driver, lb.el)
+                                if opts:
+                                    t = self.smart_select(opts)
+                                    if t:
+                                        self.clicker.click(driver, t.el, "option")
+                                        self._answer(q_idx, "dropdown", t.caption)
+                                    else:
+                                        press_escape(driver)
+                            if t:
+                                self.pace(0.5, 0.15)
                 except:
                     continue
         except:
             pass
 
-    def scrape_data(self, driver):
+    def scrape_data(self, driver, snap=None):
         data = []
-        qs = driver.find_elements(By.CSS_SELECTOR, 'div[role="listitem"]')
-        for qi, q in enumerate(qs):
+        snap = snap or snapshot_form(driver)
+        for q in snap.questions:
+            qi = q.index
             try:
-                for ri, r in enumerate(q.find_elements(By.XPATH, './/div[@role="radio"]')):
-                    if r.get_attribute("aria-checked") == "true":
-                        data.append({"type":"radio","q":qi,"r":ri,"val":r.get_attribute("data-value")})
-                saved = False
-                for ci, c in enumerate(q.find_elements(By.XPATH, './/div[@role="checkbox"]')):
-                    if c.get_attribute("aria-checked") == "true" and not saved:
-                        data.append({"type":"checkbox","q":qi,"c":ci})
-                        saved = True
+                for r in q.radios:
+                    if r.checked:
+                        data.append({"type":"radio","q":qi,"r":r.index,"val":r.value})
+                for c in q.checkboxes:
+                    if c.checked:
+                        data.append({"type":"checkbox","q":qi,"c":c.index})
                         break
-                for ti, t in enumerate(q.find_elements(By.CSS_SELECTOR,
-                        'input:not([type="hidden"]), textarea')):
-                    val = t.get_attribute("value")
-                    if val and t.get_attribute("role") not in ["radio","checkbox"]:
-                        obj = {"type":"text","q":qi,"t":ti,"val":val}
-                        k = f"{qi}_{ti}"
+                for f in q.inputs:
+                    if f.value and f.role not in ["radio","checkbox"]:
+                        obj = {"type":"text","q":qi,"t":f.index,"val":f.value}
+                        k = f"{qi}_{f.index}"
                         if k in self.page_logic_buffer:
                             obj["options_list"] = self.page_logic_buffer[k]["options_list"]
                             obj["is_linked"] = self.page_logic_buffer[k]["is_linked"]
                         data.append(obj)
-                for li, lb in enumerate(q.find_elements(By.CSS_SELECTOR,'div[role="listbox"]')):
+                for lb in q.listboxes:
                     if "เลือก" not in lb.text:
-                        data.append({"type":"dropdown","q":qi,"l":li,"val":lb.text.strip()})
+                        data.append({"type":"dropdown","q":qi,"l":lb.index,"val":lb.text.strip()})
             except:
                 pass
         return data
@@ -385,184 +460,308 @@ class SmartRandomBot:
         self.master_random_index = 0
         page_num = 1
         while True:
+            page_t0 = time.perf_counter()
+            self._page = page_num
             log(f"📄 หน้าที่ {page_num}")
-            self.auto_fill_current_page(driver, learn_mode=True)
-            time.sleep(0.5)
-            buttons = driver.find_elements(By.CSS_SELECTOR, 'div[role="button"]')
+            snap = snapshot_form(driver)
+            structure = structure_hash(snap)
+            self.auto_fill_current_page(driver, learn_mode=True, snap=snap)
+            self.pace(0.5)
+            snap = snapshot_form(driver)
             target_btn, action_type = None, "unknown"
-            for btn in buttons:
-                t = btn.text.strip()
-                if t in ["ถัดไป","Next","ต่อไป"]:
-                    action_type = "next"; target_btn = btn; break
-                if t in ["ส่ง","Submit","Send"]:
-                    action_type = "submit"; target_btn = btn; break
+            for btn in snap.buttons:
+                if btn.text in NEXT_LABELS:
+                    action_type = "next"; target_btn = btn.el; break
+                if btn.text in SUBMIT_LABELS:
+                    action_type = "submit"; target_btn = btn.el; break
             if not target_btn:
                 break
-            page_data = self.scrape_data(driver)
-            self.memory.append({"page":page_num,"action":action_type,"inputs":page_data})
-            scroll_to(driver, target_btn)
-            safe_click(driver, target_btn)
-            time.sleep(2)
+            page_data = self.scrape_data(driver, snap)
+            self.memory.append(PageRecord.compile(page_num, action_type, page_data, structure))
+            self.click_and_wait(driver, target_btn)
+            # รวมเวลารอคำตอบข้อเขียนจากผู้ใช้ด้วย (ถ้ามี)
+            self._record_page("page.learn", page_num, page_t0)
+            self.pace(2)
             if action_type == "submit":
                 log("✅ ส่งรอบที่ 1 เรียบร้อย")
                 return
             page_num += 1
 
     def replay_sequence(self, driver):
-        time.sleep(0.5)
+        self.pace(0.5)
         for step in self.memory:
             try:
-                is_random = self.mode == "random" or (
-                    self.mode == "mix" and step["page"] not in self.manual_pages)
-                if is_random:
-                    self.auto_fill_current_page(driver, learn_mode=False,
-                                                fixed_memory=step["inputs"])
-                else:
-                    qs = driver.find_elements(By.CSS_SELECTOR, 'div[role="listitem"]')
-                    for item in step["inputs"]:
-                        try:
-                            if item["q"] >= len(qs): continue
-                            q = qs[item["q"]]
-                            if item["type"] == "radio":
-                                rs = q.find_elements(By.XPATH, './/div[@role="radio"]')
-                                if len(rs) > item["r"]: safe_click(driver, rs[item["r"]])
-                            elif item["type"] == "checkbox":
-                                cs = q.find_elements(By.XPATH, './/div[@role="checkbox"]')
-                                if len(cs) > item["c"]:
-                                    if cs[item["c"]].get_attribute("aria-checked") != "true":
-                                        safe_click(driver, cs[item["c"]])
-                            elif item["type"] == "text":
-                                ins = q.find_elements(By.CSS_SELECTOR,
-                                    'input:not([type="hidden"]), textarea')
-                                if len(ins) > item["t"]:
-                                    if "options_list" in item:
-                                        choices = item["options_list"]
-                                        if choices:
-                                            if item.get("is_linked", False):
-                                                idx = self.master_random_index % len(choices)
-                                            else:
-                                                idx = random.randint(0, len(choices) - 1)
-                                                self.master_random_index = idx
-                                            quick_type(ins[item["t"]], choices[idx])
-                                            log(f"✍️ [q{item['q']}] → {choices[idx]}")
-                                    elif item.get("val"):
-                                        quick_type(ins[item["t"]], item["val"])
-                            elif item["type"] == "dropdown":
-                                lbs = q.find_elements(By.CSS_SELECTOR, 'div[role="listbox"]')
-                                if len(lbs) > item["l"]:
-                                    scroll_to(driver, lbs[item["l"]])
-                                    if self.safe_click_dropdown(driver, lbs[item["l"]]):
-                                        tc = "".join(item["val"].split())
-                                        for o in driver.find_elements(By.CSS_SELECTOR,
-                                                'div[role="option"]'):
-                                            if tc in "".join(o.text.split()):
-                                                safe_click(driver, o); break
-                                        else:
-                                            ActionChains(driver).send_keys(Keys.ESCAPE).perform()
-                        except: continue
-                btns = driver.find_elements(By.CSS_SELECTOR, 'div[role="button"]')
-                targets = (["ส่ง","Submit","Send"] if step["action"]=="submit"
-                           else ["ถัดไป","Next","ต่อไป"])
-                for btn in btns:
-                    if btn.text.strip() in targets:
-                        scroll_to(driver, btn)
-                        safe_click(driver, btn)
-                        time.sleep(1)
-                        break
+                with self._page_span("page.replay", step.page):
+                    snap = None
+                    if self.verify_structure:
+                        snap = snapshot_form(driver)
+                        if structure_hash(snap) != step.structure:
+                            raise SchemaMismatch(step.page)
+                    is_random = self.mode == "random" or (
+                        self.mode == "mix" and step.page not in self.manual_pages)
+                    if is_random:
+                        self.auto_fill_current_page(driver, learn_mode=False,
+                                                    fixed_memory=step, snap=snap)
+                    else:
+                        qs = (snap or snapshot_form(driver)).questions
+                        for item in step.actions:
+                            try:
+                                if item.q >= len(qs): continue
+                                q = qs[item.q]
+                                if item.kind == "radio":
+                                    if len(q.radios) > item.pos:
+                                        with _metrics.span("fill.radio"):
+                                            self.clicker.click(driver, q.radios[item.pos].el, "radio")
+                                        self._answer(item.q, "radio", q.radios[item.pos].caption)
+                                elif item.kind == "checkbox":
+                                    if len(q.checkboxes) > item.pos:
+                                        if not q.checkboxes[item.pos].checked:
+                                            with _metrics.span("fill.checkbox"):
+                                                self.clicker.click(driver, q.checkboxes[item.pos].el, "checkbox")
+                                            self._answer(item.q, "checkbox", q.checkboxes[item.pos].caption)
+                                elif item.kind == "text":
+                                    if len(q.inputs) > item.pos:
+                                        el = q.inputs[item.pos].el
+                                        if item.options_list is not None:
+                                            choices = item.options_list
+                                            if choices:
+                                                if item.is_linked:
+                                                    idx = self.master_random_index % len(choices)
+                                                else:
+                                                    idx = self.rng.randint(0, len(choices) - 1)
+                                                    self.master_random_index = idx
+                                                quick_type(el, choices[idx])
+                                                self._answer(item.q, "text", choices[idx])
+                                                log(f"✍️ [q{item.q}] → {choices[idx]}")
+                                        elif item.val:
+                                            quick_type(el, item.val)
+                                            self._answer(item.q, "text", item.val)
+                                elif item.kind == "dropdown":
+                                    if len(q.listboxes) > item.pos:
+                                        with _metrics.span("fill.dropdown"):
+                                            opts = self.clicker.open_dropdown(driver, q.listboxes[item.pos].el)
+                                            if opts:
+                                                tc = "".join(item.val.split())
+                                                for o in opts:
+                                                    if tc in "".join(o.text.split()):
+                                                        self.clicker.click(driver, o.el, "option")
+                                                        self._answer(item.q, "dropdown", o.text.strip())
+                                                        break
+                                                else:
+                                                    press_escape(driver)
+                            except: continue
+                    targets = SUBMIT_LABELS if step.action=="submit" else NEXT_LABELS
+                    btn = find_button(snapshot_buttons(driver), targets)
+                    if btn:
+                        self.click_and_wait(driver, btn.el)
+                        self.pace(1)
+            except SchemaMismatch:
+                raise
             except Exception as e:
-                log(f"⚠️ Replay error: {e}")
+                log(f"⚠️ Replay error: {e}", "warn")
+
+    def load_schema(self, driver):
+        """โหลด memory ของฟอร์มนี้จาก cache ถ้าโครงสร้างหน้าแรกยังตรงกัน"""
+        if not self.use_schema_cache:
+            return False
+        cached = self.schema_cache.load(self.url, structure_hash(snapshot_form(driver)))
+        if not cached:
+            return False
+        self.memory, self.page_logic_buffer = cached
+        self.master_random_index = 0
+        self.verify_structure = True
+        log(f"📦 ใช้ schema ที่เรียนรู้ไว้ ({len(self.memory)} หน้า) — ข้ามรอบเรียนรู้")
+        return True
+
+    def save_schema(self):
+        if not self.use_schema_cache or not self.memory or self.memory[-1].action != "submit":
+            return
+        try:
+            self.schema_cache.save(self.url, self.memory, self.page_logic_buffer)
+        except OSError as e:
+            log(f"⚠️ บันทึก schema ไม่สำเร็จ: {e}", "warn")
+
+    def learn_round(self, driver, n=1):
+        self.verify_structure = False
+        self._begin_round(n, "learn")
+        self.scan_and_learn(driver)
+        ok = bool(self.memory) and self.memory[-1].action == "submit"
+        self._end_round(ok, None if ok else "ไม่พบปุ่ม ถัดไป/ส่ง")
+        self.save_schema()
 
     def run(self):
-        global bot_status, _resume_event
-        bot_status.update({
-            "running": True, "logs": [], "completed": 0,
-            "total": self.rounds, "error": None,
-            "paused": False, "pending_inputs": [], "answers": None,
-        })
-        _resume_event.set()
+        set_status(
+            running=True, owner=os.getpid(), completed=0,
+            total=self.rounds, error=None,
+            paused=False, pending_inputs=[], answers=None,
+            driver=None,
+        )
+        _logs.clear()
+        _logs.round = 1
+        _metrics.reset()
+        _metrics.round = 1
 
         driver = None
         try:
+            try:
+                self.report = RunReport(self.report_dir)
+                set_status(report=self.report.id)
+            except OSError as e:
+                # report เป็นของเสริม — เขียนโฟลเดอร์ไม่ได้ก็ทำงานต่อโดยไม่มี report
+                self.report = None
+                log(f"⚠️ สร้าง report ไม่สำเร็จ (รันต่อโดยไม่บันทึก report): {e}", "warn")
             log("🚀 กำลังเปิดเบราว์เซอร์...")
-            driver = setup_driver(self.headless)
-            driver.get(self.url)
-            time.sleep(1.5)
+            with _metrics.span("setup_driver"):
+                driver, kind = _driver_pool.acquire(self.headless)
+            _metrics.instrument(driver)
+            set_status(driver=dict(_driver_pool.starts[-1]), driver_starts=_driver_pool.stats())
+            log(f"🖥️ เบราว์เซอร์พร้อม ({kind} start {bot_status['driver']['seconds']:.2f}s)")
+            self.open_form(driver)
             log(f"🌐 เปิดฟอร์มสำเร็จ")
             log(f"⚙️ Mode: {self.mode} | Speed: {self.speed_mode} | Rounds: {self.rounds}")
 
-            self.scan_and_learn(driver)
-            completed = 1
-            bot_status["completed"] = completed
+            completed = 0
+            if not self.load_schema(driver):
+                self.learn_round(driver)
+                completed = 1
+                set_status(completed=completed)
+                publish_metrics()
 
-            if self.speed_mode == "human" and self.rounds > 1:
-                d = random.randint(10, 30)
-                log(f"☕ พักเบรก {d} วินาที...")
-                time.sleep(d)
+                if self.speed_mode == "human" and self.rounds > 1:
+                    d = random.randint(10, 30)
+                    log(f"☕ พักเบรก {d} วินาที...")
+                    time.sleep(d)
 
             while completed < self.rounds:
                 if not bot_status["running"]:
                     break
+                _logs.round = _metrics.round = completed + 1
                 log(f"\n>>> รอบที่ {completed + 1} / {self.rounds} <<<")
-                driver.get(self.url)
-                time.sleep(1.5)
+                self._begin_round(completed + 1, "replay")
+                self.open_form(driver)
                 try:
                     self.replay_sequence(driver)
-                    try:
-                        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.XPATH,
-                            "//*[contains(text(),'บันทึกคำตอบ') or "
-                            "contains(text(),'response has been recorded') or "
-                            "contains(text(),'ส่งคำตอบเพิ่ม')]")))
+                    if self.waiter.confirmation(driver):
+                        self._end_round(True)
+                        self.verify_structure = False
                         completed += 1
-                        bot_status["completed"] = completed
+                        set_status(completed=completed)
                         log(f"✅ รอบที่ {completed} สำเร็จ!")
                         if self.speed_mode == "human" and completed < self.rounds:
                             d = random.randint(10, 30)
                             log(f"☕ พักเบรก {d} วินาที...")
                             time.sleep(d)
-                    except:
-                        log(f"❌ รอบที่ {completed + 1} ไม่สำเร็จ")
+                    else:
+                        self._end_round(False, f"ไม่พบหน้ายืนยันภายใน {self.waiter.confirm_timeout:g} วินาที")
+                        log(f"❌ รอบที่ {completed + 1} ไม่สำเร็จ", "error")
+                except SchemaMismatch as e:
+                    self._end_round(False, f"โครงสร้างหน้า {e} ไม่ตรงกับ schema")
+                    log(f"♻️ โครงสร้างฟอร์มหน้า {e} ไม่ตรงกับ schema ที่บันทึกไว้ → เรียนรู้ใหม่", "warn")
+                    self.schema_cache.invalidate(self.url)
+                    self.open_form(driver)
+                    self.learn_round(driver, completed + 1)
+                    completed += 1
+                    set_status(completed=completed)
                 except Exception as e:
-                    log(f"⚠️ Error: {e}")
+                    self._end_round(False, f"error: {e}")
+                    log(f"⚠️ Error: {e}", "warn")
+                publish_metrics()
 
             log(f"\n🎉 เสร็จสิ้น {completed}/{self.rounds} รอบ")
+            for name, st in self.waiter.summary().items():
+                log(f"⏱️ รอ {name}: {st['count']} ครั้ง | เฉลี่ย {st['avg']:.2f}s | "
+                    f"สูงสุด {st['max']:.2f}s | timeout {st['timeouts']}")
         except Exception as e:
-            bot_status["error"] = str(e)
-            log(f"❌ Fatal: {e}")
+            self._end_round(False, f"fatal: {e}")
+            set_status(error=str(e))
+            log(f"❌ Fatal: {e}", "error")
         finally:
-            if driver:
+            self._end_round(False, "งานหยุดกลางรอบ")
+            warm = bool(driver) and self.keep_warm and bot_status["error"] is None
+            if warm:
+                _driver_pool.release(driver, self.headless, self.url)
+            elif driver:
                 try: driver.quit()
                 except: pass
-            bot_status["running"] = False
-            bot_status["paused"] = False
-            log("🔒 ปิดเบราว์เซอร์แล้ว")
+            log("♨️ เก็บเบราว์เซอร์ไว้ใช้กับงานถัดไป" if warm else "🔒 ปิดเบราว์เซอร์แล้ว")
+            set_status(running=False, paused=False, metrics=_metrics.snapshot())
 
 
 _bot_thread = None
+_start_lock = threading.Lock()
 
-def start_bot(config):
-    global _bot_thread, bot_status
-    if bot_status.get("running"):
-        return "บอทกำลังทำงานอยู่แล้ว"
+
+def _job_alive(st):
+    """งานที่ status บอกว่า running ยังมีเจ้าของอยู่จริงไหม (กัน flag ค้างจาก worker ที่ตายไป)"""
+    if not st.get("running"):
+        return False
+    owner = st.get("owner")
+    if owner is None:
+        return False
+    if owner == os.getpid():
+        return _bot_thread is not None and _bot_thread.is_alive()
     try:
-        bot = SmartRandomBot(config)
-        _bot_thread = threading.Thread(target=bot.run, daemon=True)
-        _bot_thread.start()
-        return None
-    except Exception as e:
-        return str(e)
+        os.kill(owner, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _run_profiled(bot):
+    """bot.run ภายใต้ RunProfiler — ใช้เฉพาะงานที่ขอ profile (งานปกติรัน bot.run ตรง ๆ)"""
+    set_status(profile=None)
+    prof = RunProfiler(PROFILE_DIR)
+    try:
+        prof.run(bot.run)
+    finally:
+        try:
+            info = prof.save()
+            set_status(profile=info)
+            log(f"🔬 บันทึก profile {info['id']} ({info['seconds']:.1f}s, {info['samples']} samples)")
+        except OSError as e:
+            log(f"⚠️ บันทึก profile ไม่สำเร็จ: {e}", "warn")
+
+
+def start_bot(config):
+    global _bot_thread
+    with _start_lock:
+        if _job_alive(bot_status.snapshot()[1]):
+            return "บอทกำลังทำงานอยู่แล้ว"
+        try:
+            bot = SmartRandomBot(config)
+        except Exception as e:
+            return str(e)
+        # จอง running แบบ atomic ก่อน thread เริ่ม — กัน start ซ้อนข้าม worker และ stream
+        # ที่เปิดทันทีหลัง start จะไม่เห็นสถานะเก่า
+        if not bot_status.update_if(lambda st: not _job_alive(st),
+                                    running=True, owner=os.getpid(), completed=0,
+                                    total=bot.rounds, error=None, paused=False):
+            return "บอทกำลังทำงานอยู่แล้ว"
+        try:
+            _logs.clear()
+            target = (lambda: _run_profiled(bot)) if bot.profile else bot.run
+            _bot_thread = threading.Thread(target=target, daemon=True)
+            _bot_thread.start()
+            return None
+        except Exception as e:
+            set_status(running=False)
+            return str(e)
 
 def submit_text_answers(answers):
-    global _resume_event
-    bot_status["answers"] = answers
-    bot_status["paused"] = False
-    _resume_event.set()
+    set_status(answers=answers, paused=False, pending_inputs=[])
     log("▶️ รับคำตอบแล้ว กำลังรันต่อ...")
 
 def get_status():
-    return dict(bot_status)
+    """snapshot อ่านอย่างเดียวของสถานะ (ไม่รวม log — อ่านผ่าน read_logs)"""
+    return bot_status.snapshot()[1]
+
+
+def status_snapshot():
+    """(version, snapshot) สำหรับทำ ETag"""
+    return bot_status.snapshot()
 
 def stop_bot():
-    global _resume_event
-    bot_status["running"] = False
-    _resume_event.set()
-    bot_status["logs"].append("🛑 หยุดบอทโดยผู้ใช้")
\ No newline at end of file
+    set_status(running=False)
+    log("🛑 หยุดบอทโดยผู้ใช้", "warn")
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""สถานะของงานบอท — แก้ผ่าน lock ตัวเดียว และมี version เพิ่มทุกครั้งที่เปลี่ยน
+
+ทุกครั้งที่ update จะสร้าง snapshot แบบอ่านอย่างเดียว (MappingProxyType) เก็บไว้
+ฝั่ง Flask อ่าน snapshot นั้นได้เลยโดยไม่ต้อง lock หรือ copy และใช้ version ทำ ETag
+Condition ตัวเดียวกันยังใช้ปลุก SSE stream เมื่อมี log ใหม่ด้วย (notify)
+"""
+import os
+import threading
+from types import MappingProxyType
+
+
+class BotStatus:
+    def __init__(self, **initial):
+        self._cond = threading.Condition()
+        self._data = dict(initial)
+        self._version = 0
+        self._snap = MappingProxyType(dict(self._data))
+        # version เริ่มที่ 0 ทุกครั้งที่ restart — epoch กัน ETag ซ้ำข้าม process
+        self.epoch = os.urandom(4).hex()
+
+    @property
+    def version(self):
+        return self._version
+
+    def snapshot(self):
+        """คืน (version, snapshot) ที่ตรงกันเสมอ"""
+        with self._cond:
+            return self._version, self._snap
+
+    def get(self, key, default=None):
+        return self._snap.get(key, default)
+
+    def __getitem__(self, key):
+        return self._snap[key]
+
+    def _commit(self, fields):
+        self._data.update(fields)
+        self._version += 1
+        self._snap = MappingProxyType(dict(self._data))
+        self._cond.notify_all()
+
+    def update(self, **fields):
+        with self._cond:
+            self._commit(fields)
+
+    def update_if(self, predicate, **fields):
+        """update แบบ atomic เมื่อ predicate(snapshot) เป็นจริง — คืน True ถ้า update"""
+        with self._cond:
+            if not predicate(self._snap):
+                return False
+            self._commit(fields)
+            return True
+
+    def notify(self):
+        with self._cond:
+            self._cond.notify_all()
+
+    def wait_for(self, predicate, timeout=None):
+        with self._cond:
+            return self._cond.wait_for(predicate, timeout)
@@ -0,0 +1,90 @@
+"""รายชื่อผู้ใช้จาก users.xlsx — อ่านไฟล์ครั้งเดียวแล้วเก็บเป็น dict ใน memory
+
+อ่านใหม่เฉพาะเมื่อ mtime/size ของไฟล์เปลี่ยน (เช็คด้วย os.stat ทุกครั้งที่ login)
+รหัสผ่านเก็บเป็น HMAC-SHA256 กับ salt สุ่มต่อ user และเทียบด้วย
+hmac.compare_digest — ชื่อผู้ใช้ที่ไม่มีอยู่ก็เทียบกับ hash หลอก เพื่อให้เวลาเท่ากัน
+"""
+import hashlib
+import hmac
+import os
+import threading
+
+
+def _digest(salt, password):
+    return hmac.new(salt, password.encode("utf-8"), hashlib.sha256).digest()
+
+
+def read_users_file(path):
+    """อ่าน users.xlsx → {username: password} (plain text ตามไฟล์)"""
+    if not os.path.exists(path):
+        raise RuntimeError(f"ไม่พบไฟล์ {path}")
+
+    users = {}
+    try:
+        import openpyxl
+    except ImportError:
+        openpyxl = None
+
+    if openpyxl is not None:
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            headers = [str(c).strip().lower() if c else "" for c in next(rows, ())]
+            u_col = headers.index("username") if "username" in headers else 0
+            p_col = headers.index("password") if "password" in headers else 1
+            for row in rows:
+                u = str(row[u_col]).strip() if len(row) > u_col and row[u_col] else ""
+                p = str(row[p_col]).strip() if len(row) > p_col and row[p_col] else ""
+                if u:
+                    users[u] = p
+        finally:
+            wb.close()
+        return users
+
+    try:
+        import pandas as pd
+    except ImportError:
+        raise RuntimeError("ต้องติดตั้ง pandas หรือ openpyxl ก่อน")
+    df = pd.read_excel(path)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    for u, p in zip(df.get("username", []), df.get("password", [])):
+        u = str(u).strip()
+        if u:
+            users[u] = str(p).strip()
+    return users
+
+
+class CredentialStore:
+    def __init__(self, path):
+        self.path = path
+        self._users = {}            # username -> (salt, digest)
+        self._stamp = None          # (mtime_ns, size) ของไฟล์ที่โหลดล่าสุด
+        self._lock = threading.Lock()
+        self._dummy = (os.urandom(16), _digest(b"\0" * 16, ""))
+
+    def _reload_if_changed(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            raise RuntimeError(f"ไม่พบไฟล์ {self.path}")
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+        with self._lock:
+            if stamp == self._stamp:
+                return
+            users = {}
+            for u, p in read_users_file(self.path).items():
+                salt = os.urandom(16)
+                users[u] = (salt, _digest(salt, p))
+            self._users, self._stamp = users, stamp
+
+    def __len__(self):
+        self._reload_if_changed()
+        return len(self._users)
+
+    def verify(self, username, password):
+        self._reload_if_changed()
+        salt, expected = self._users.get(username, self._dummy)
+        ok = hmac.compare_digest(_digest(salt, password), expected)
+        return ok and username in self._users
@@ -0,0 +1,146 @@
+"""หา chromedriver ครั้งเดียว + เก็บ Chrome ที่อุ่นไว้ใช้ข้ามงาน
+
+- resolve_chromedriver(): ถ้าตั้ง CHROMEDRIVER_PATH ไว้จะใช้ไฟล์นั้นเลย ไม่งั้นเรียก
+  ChromeDriverManager().install() แล้ว cache path ไว้ CHROMEDRIVER_CACHE_TTL วินาที
+  (refresh=True ทิ้ง cache แล้วหาใหม่ — ใช้ตอน Chrome อัปเดตจน path เดิมเปิดไม่ได้)
+- DriverPool: เก็บ browser ว่างไว้หนึ่งตัวต่อโหมด headless เมื่อมีงานใหม่จะล้าง
+  cookie / storage / tab ก่อนส่งต่อ ถ้าว่างนานเกิน idle_ttl จะปิดทิ้ง
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "")
+CHROMEDRIVER_CACHE_TTL = float(os.environ.get("CHROMEDRIVER_CACHE_TTL", 24 * 3600))
+
+_resolved = {"path": None, "at": 0.0}
+_resolve_lock = threading.Lock()
+
+
+def resolve_chromedriver(refresh=False):
+    """คืน (path, seconds ที่ใช้หา, cached) — cached=True ถ้า path มาจาก cache"""
+    t0 = time.perf_counter()
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH, 0.0, False
+    with _resolve_lock:
+        if (not refresh and _resolved["path"]
+                and time.time() - _resolved["at"] < CHROMEDRIVER_CACHE_TTL):
+            return _resolved["path"], time.perf_counter() - t0, True
+        _resolved["path"] = None
+        from webdriver_manager.chrome import ChromeDriverManager
+        _resolved["path"] = ChromeDriverManager().install()
+        _resolved["at"] = time.time()
+        return _resolved["path"], time.perf_counter() - t0, False
+
+
+def origin_of(url):
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme and parts.netloc else None
+
+
+def reset_driver(driver, origins=()):
+    """ล้างสถานะที่งานก่อนทิ้งไว้: tab เกิน, cookie ทุกโดเมน, local/session storage, cache"""
+    handles = driver.window_handles
+    for h in handles[1:]:
+        driver.switch_to.window(h)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    for origin in origins:
+        try:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                   {"origin": origin, "storageTypes": "all"})
+        except Exception:
+            pass
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    except Exception:
+        pass
+    # delete_all_cookies ลบได้เฉพาะ cookie ที่ document ปัจจุบันเห็น — CDP ล้างทุกโดเมน
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except Exception:
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+class DriverPool:
+    def __init__(self, factory, idle_ttl=600):
+        self.factory = factory          # factory(headless) -> driver (cold start)
+        self.idle_ttl = idle_ttl
+        self._idle = {}                 # headless -> (driver, origins, released_at, timer)
+        self._lock = threading.Lock()
+        self.starts = []                # {"kind", "seconds", "at"}
+
+    def acquire(self, headless=True):
+        """คืน (driver, kind) — kind เป็น "warm" ถ้าได้ตัวที่อุ่นไว้, ไม่งั้น "cold" """
+        t0 = time.perf_counter()
+        with self._lock:
+            entry = self._idle.pop(headless, None)
+        if entry:
+            driver, origins, _, timer = entry
+            timer.cancel()
+            try:
+                reset_driver(driver, origins)
+                return driver, self._record("warm", t0)
+            except Exception:
+                self._quit(driver)
+        driver = self.factory(headless)
+        return driver, self._record("cold", t0)
+
+    def release(self, driver, headless=True, url=None):
+        """เก็บ driver ไว้ใช้งานถัดไป (ถ้ามีตัวอุ่นอยู่แล้วจะปิดตัวเก่าทิ้ง)
+
+        ล้าง storage ทั้ง origin ของ url ที่ตั้งไว้และของหน้าที่เปิดอยู่จริง
+        (เช่น forms.gle redirect ไป docs.google.com)"""
+        try:
+            current = driver.current_url
+        except Exception:
+            current = None
+        origins = list(dict.fromkeys(o for o in (origin_of(url), origin_of(current)) if o))
+        timer = threading.Timer(self.idle_ttl, self._expire, args=(headless, driver))
+        timer.daemon = True
+        with self._lock:
+            old = self._idle.pop(headless, None)
+            self._idle[headless] = (driver, origins, time.time(), timer)
+        timer.start()
+        if old:
+            old[3].cancel()
+            self._quit(old[0])
+
+    def _expire(self, headless, driver):
+        with self._lock:
+            entry = self._idle.get(headless)
+            if not entry or entry[0] is not driver:
+                return
+            del self._idle[headless]
+        self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _record(self, kind, t0):
+        self.starts.append({"kind": kind, "seconds": time.perf_counter() - t0, "at": time.time()})
+        del self.starts[:-50]
+        return kind
+
+    def stats(self):
+        out = {}
+        for s in self.starts:
+            st = out.setdefault(s["kind"], {"count": 0, "total": 0.0, "last": 0.0})
+            st["count"] += 1
+            st["total"] += s["seconds"]
+            st["last"] = s["seconds"]
+        for st in out.values():
+            st["avg"] = st.pop("total") / st["count"]
+        return out
+
+    def shutdown(self):
+        with self._lock:
+            entries, self._idle = list(self._idle.values()), {}
+        for driver, _, _, timer in entries:
+            timer.cancel()
+            self._quit(driver)
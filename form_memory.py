@@ -0,0 +1,74 @@
+"""Compiled form memory — สิ่งที่บอทจำได้จากรอบเรียนรู้
+
+scrape_data ยังคืน list ของ dict เหมือนเดิม แต่ก่อนเก็บลง self.memory จะ
+compile เป็น PageRecord ที่เก็บ actions ตามลำดับ (ใช้ตอน replay แบบ fixed) และ
+index ข้อเขียนตาม (q, t) ทำให้ auto_fill หาคำตอบได้ O(1) แทนการ next(...) ไล่ทั้ง list
+"""
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class InputRecord:
+    kind: str               # radio / checkbox / text / dropdown
+    q: int
+    pos: int                # r / c / t / l ตามชนิด
+    val: str | None = None
+    options_list: list | None = None
+    is_linked: bool = False
+
+    @classmethod
+    def from_dict(cls, d):
+        kind = d["type"]
+        return cls(
+            kind=kind,
+            q=d["q"],
+            pos=d[_POS_KEY[kind]],
+            val=d.get("val"),
+            options_list=d.get("options_list"),
+            is_linked=d.get("is_linked", False),
+        )
+
+    def to_dict(self):
+        d = {"type": self.kind, "q": self.q, _POS_KEY[self.kind]: self.pos}
+        if self.kind != "checkbox":
+            d["val"] = self.val
+        if self.options_list is not None:
+            d["options_list"] = self.options_list
+            d["is_linked"] = self.is_linked
+        return d
+
+
+_POS_KEY = {"radio": "r", "checkbox": "c", "text": "t", "dropdown": "l"}
+
+
+@dataclass(slots=True)
+class PageRecord:
+    page: int
+    action: str
+    structure: str = ""                                 # structure_hash ของหน้าตอนเรียนรู้
+    actions: list = field(default_factory=list)         # InputRecord ตามลำดับที่ scrape ได้
+    _text: dict = field(default_factory=dict, repr=False)   # (q, t) -> InputRecord
+
+    @classmethod
+    def compile(cls, page, action, inputs, structure=""):
+        rec = cls(page=page, action=action, structure=structure)
+        for d in inputs:
+            rec.add(InputRecord.from_dict(d))
+        return rec
+
+    def add(self, item):
+        self.actions.append(item)
+        if item.kind == "text":
+            # ตัวแรกชนะ — เหมือน next(...) เดิม
+            self._text.setdefault((item.q, item.pos), item)
+
+    def text(self, q, t):
+        return self._text.get((q, t))
+
+    def to_dict(self):
+        return {"page": self.page, "action": self.action, "structure": self.structure,
+                "inputs": [a.to_dict() for a in self.actions]}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls.compile(d["page"], d["action"], d.get("inputs", []), d.get("structure", ""))
@@ -0,0 +1,212 @@
+"""DOM snapshot ของ Google Form — อ่านทั้งหน้าด้วย execute_script ครั้งเดียว
+
+แทนที่การเรียก find_elements / get_attribute ทีละข้อ (ซึ่งเป็น HTTP round trip
+ไปหา WebDriver ทุกครั้ง) ด้วยสคริปต์เดียวที่คืนโครงสร้างของทุก
+div[role="listitem"] พร้อม WebElement ของแต่ละตัวเลือก — โค้ดฝั่งบอทอ่านค่า
+จาก model นี้ และแตะ WebDriver เฉพาะตอนคลิก/พิมพ์จริงเท่านั้น
+"""
+from dataclasses import dataclass, field
+
+
+_SNAPSHOT_JS = r"""
+const txt = el => (el.innerText || "");
+const choice = (el, i) => ({
+  el: el, index: i,
+  checked: el.getAttribute("aria-checked") === "true",
+  value: el.getAttribute("data-value"),
+  label: el.getAttribute("aria-label"),
+  text: txt(el),
+});
+// known = {index: sig} ของข้อที่ทำเสร็จแล้ว — ถ้า sig ยังเท่าเดิมไม่ต้องส่งข้อนั้นกลับ
+const known = arguments[0] || {};
+const questions = Array.from(document.querySelectorAll('div[role="listitem"]')).map((q, qi) => {
+  const h = q.querySelector('div[role="heading"]');
+  const sig = (h ? txt(h).slice(0, 80) : "") + "|" + q.querySelectorAll(
+    'div[role="radio"], div[role="checkbox"], div[role="listbox"], input, textarea').length;
+  if (known[qi] === sig) return null;
+  const radios = Array.from(q.querySelectorAll('div[role="radio"]'));
+  const groups = Array.from(q.querySelectorAll('div[role="radiogroup"]')).map(
+    rg => Array.from(rg.querySelectorAll('div[role="radio"]')).map(r => radios.indexOf(r)));
+  let ti = 0;
+  const inputs = Array.from(q.querySelectorAll('input:not([type="hidden"]), textarea')).map((el, i) => {
+    const isText = el.matches('input[type="text"], textarea');
+    return {
+      el: el, index: i, text_index: isText ? ti++ : -1,
+      label: el.getAttribute("aria-label"), value: el.value || "",
+      role: el.getAttribute("role"),
+    };
+  });
+  return {
+    index: qi, el: q, heading: h ? txt(h) : null, sig: sig,
+    radios: radios.map(choice), radiogroups: groups,
+    checkboxes: Array.from(q.querySelectorAll('div[role="checkbox"]')).map(choice),
+    inputs: inputs,
+    listboxes: Array.from(q.querySelectorAll('div[role="listbox"]')).map(
+      (el, i) => ({el: el, index: i, text: txt(el)})),
+  };
+}).filter(q => q !== null);
+const buttons = Array.from(document.querySelectorAll('div[role="button"]')).map(
+  b => ({el: b, text: txt(b).trim()}));
+return {questions: questions, buttons: buttons};
+"""
+
+_BUTTONS_JS = r"""
+return Array.from(document.querySelectorAll('div[role="button"]')).map(
+  b => ({el: b, text: (b.innerText || "").trim()}));
+"""
+
+_OPTIONS_JS = r"""
+const [choosable, listbox] = arguments;
+if (listbox && listbox.getAttribute("aria-expanded") === "false") return [];
+let opts = Array.from(document.querySelectorAll('div[role="option"]')).map((el, i) => ({
+  el: el, index: i, checked: el.getAttribute("aria-selected") === "true",
+  value: el.getAttribute("data-value"), label: el.getAttribute("aria-label"),
+  text: el.innerText || "",
+}));
+// ตัวที่เลือกอยู่ (เช่น placeholder "เลือก" data-value="") มองเห็นตลอดแม้ dropdown ยังไม่เปิด
+if (choosable) opts = opts.filter(o => o.value && !o.checked && o.el.getClientRects().length > 0);
+return opts;
+"""
+
+
+@dataclass(slots=True)
+class Choice:
+    """radio / checkbox / option หนึ่งตัว"""
+    el: object
+    index: int
+    checked: bool
+    value: str | None
+    label: str | None
+    text: str
+
+    @property
+    def caption(self):
+        return self.label or self.text or self.value or ""
+
+
+@dataclass(slots=True)
+class TextField:
+    """input/textarea ใน listitem — index คือตำแหน่งใน input ทั้งหมด (ใช้ใน memory),
+    text_index คือตำแหน่งเฉพาะช่อง text/textarea (-1 ถ้าไม่ใช่ช่องพิมพ์)"""
+    el: object
+    index: int
+    text_index: int
+    label: str | None
+    value: str
+    role: str | None
+
+    @property
+    def is_other(self):
+        lbl = self.label or ""
+        return "คำตอบอื่นๆ" in lbl or "Other" in lbl
+
+
+@dataclass(slots=True)
+class Listbox:
+    el: object
+    index: int
+    text: str
+
+
+@dataclass(slots=True)
+class Button:
+    el: object
+    text: str
+
+
+@dataclass(slots=True)
+class Question:
+    index: int
+    el: object
+    heading: str | None
+    radios: list = field(default_factory=list)
+    radiogroups: list = field(default_factory=list)
+    checkboxes: list = field(default_factory=list)
+    inputs: list = field(default_factory=list)
+    listboxes: list = field(default_factory=list)
+    sig: str = ""       # หัวข้อ + จำนวนช่องกรอกใน subtree — ใช้ดูว่า DOM ของข้อนี้เปลี่ยนไหม
+
+    @property
+    def text_inputs(self):
+        return [f for f in self.inputs if f.text_index >= 0]
+
+    def title(self, limit=80):
+        if self.heading:
+            return self.heading.replace("\n", " ").strip()[:limit]
+        return f"คำถาม #{self.index + 1}"
+
+
+@dataclass(slots=True)
+class FormSnapshot:
+    questions: list
+    buttons: list
+
+
+def find_button(buttons, labels):
+    for b in buttons:
+        if b.text in labels:
+            return b
+    return None
+
+
+def _question(raw):
+    radios = [Choice(**r) for r in raw["radios"]]
+    return Question(
+        index=raw["index"],
+        el=raw["el"],
+        heading=raw["heading"],
+        radios=radios,
+        radiogroups=[[radios[i] for i in g if i >= 0] for g in raw["radiogroups"]],
+        checkboxes=[Choice(**c) for c in raw["checkboxes"]],
+        inputs=[TextField(**f) for f in raw["inputs"]],
+        listboxes=[Listbox(**lb) for lb in raw["listboxes"]],
+        sig=raw.get("sig", ""),
+    )
+
+
+def snapshot_form(driver, known=None):
+    """อ่าน listitem ทั้งหน้า + ปุ่ม ใน round trip เดียว
+    known = {index: sig} → ข้ามข้อที่ sig ยังตรง (questions จะมีเฉพาะข้อที่เหลือ)"""
+    raw = driver.execute_script(_SNAPSHOT_JS, known or {}) or {}
+    return FormSnapshot(
+        questions=[_question(q) for q in raw.get("questions", [])],
+        buttons=[Button(**b) for b in raw.get("buttons", [])],
+    )
+
+
+def snapshot_buttons(driver):
+    return [Button(**b) for b in (driver.execute_script(_BUTTONS_JS) or [])]
+
+
+def snapshot_options(driver, choosable=False, listbox=None):
+    """ตัวเลือกของ dropdown ที่เปิดอยู่ (div[role="option"])
+    choosable=True เอาเฉพาะตัวที่แสดงบนจอ มี data-value และยังไม่ถูกเลือก (ตัด placeholder)
+    listbox: ถ้าให้มาและ aria-expanded="false" ถือว่ายังไม่เปิด คืน []"""
+    return [Choice(**o) for o in (driver.execute_script(_OPTIONS_JS, choosable, listbox) or [])]
+
+
+class PageModel:
+    """คำถามของหน้าที่กำลังกรอก — จำ sig ของแต่ละข้อ และข้อที่ทำเสร็จแล้ว
+
+    refresh() ส่ง sig ของข้อที่เสร็จแล้วไปให้ JS ข้าม จึงได้กลับมาเฉพาะข้อที่ยังไม่เสร็จ
+    หรือ DOM เปลี่ยน (เช่น section ที่โผล่ตามคำตอบ) — changed คือ index ของข้อที่ใหม่
+    หรือ sig ต่างจากที่เห็นครั้งก่อน
+    """
+
+    def __init__(self, snap):
+        self.sigs = {q.index: q.sig for q in snap.questions}
+        self.done = set()
+        self.changed = set()
+
+    def complete(self, q):
+        self.done.add(q.index)
+
+    def refresh(self, driver):
+        snap = snapshot_form(driver, {i: self.sigs[i] for i in self.done})
+        self.changed = set()
+        for q in snap.questions:
+            if self.sigs.get(q.index) != q.sig:
+                self.changed.add(q.index)
+                self.done.discard(q.index)
+            self.sigs[q.index] = q.sig
+        return snap
@@ -0,0 +1,14 @@
+# gunicorn อ่านไฟล์นี้อัตโนมัติเมื่อรันจากโฟลเดอร์ของ repo:  gunicorn app:app
+#
+# /api/bot/stream (SSE) ถือ connection ค้างไว้ตลอดที่ dashboard เปิด — sync worker
+# (ค่าเริ่มต้น) จะติดอยู่กับ stream เดียว /api/bot/answer, /api/bot/stop ค้าง และโดน
+# timeout kill ทั้ง worker (พร้อม thread ของบอท) จึงใช้ gthread ให้ request อื่นได้ thread ของตัวเอง
+import os
+
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 16))
+
+# state ของบอทอยู่ใน memory ของ process — หลาย worker ต้องตั้ง BOT_STATE_BACKEND=sqlite
+workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+timeout = 120
@@ -0,0 +1,116 @@
+"""คลิก / scroll / เปิด dropdown แบบเช็คก่อนทำ แทนการลองแล้วจับ exception
+
+- scroll(): scrollIntoView แบบ instant ใน execute_script เดียว ไม่ต้อง sleep รอ
+- click(): เช็คก่อนว่า element ยังอยู่ใน DOM / ไม่ disabled / จุดกลางไม่ถูกบัง
+  แล้วค่อย native click — ถ้าถูกบังหรือ native click ใช้ไม่ได้ จะเปลี่ยน element
+  ชนิดนั้น (radio / checkbox / option / listbox / button) ไปใช้ JS click ตลอดฟอร์ม
+  (จำไว้ใน strategy) ซึ่ง scroll + click ได้ในคำสั่งเดียว
+- open_dropdown(): คลิก listbox แล้ว poll ถี่ ๆ จน aria-expanded="true" และมีตัวเลือกที่
+  เลือกได้โผล่ (ไม่นับ placeholder / ตัวที่เลือกอยู่) คืน list[Choice] ไปเลย ไม่ต้อง snapshot ซ้ำ
+
+retry / fallback / element หลุดจาก DOM ถูกนับใน metrics (safe_click.*)
+"""
+import time
+
+from form_snapshot import snapshot_options
+
+_CHECK_JS = r"""
+const el = arguments[0];
+if (!el || !el.isConnected) return "detached";
+if (el.getAttribute("aria-disabled") === "true" || el.disabled) return "disabled";
+el.scrollIntoView({block: "center", behavior: "instant"});
+"""
+
+_SCROLL_JS = _CHECK_JS + 'return "ok";'
+
+# จุดกลางของ element คลิกถึงตัวมันเองจริงไหม (ไม่ถูก header / popup บัง)
+_PREPARE_JS = _CHECK_JS + r"""
+const r = el.getBoundingClientRect();
+if (r.width === 0 || r.height === 0) return "hidden";
+const hit = document.elementFromPoint(r.left + r.width / 2, r.top + r.height / 2);
+return hit && (hit === el || el.contains(hit) || hit.contains(el)) ? "ok" : "covered";
+"""
+
+_CLICK_JS = _CHECK_JS + 'el.click();\nreturn "clicked";'
+
+
+class Clicker:
+    """หนึ่งตัวต่อฟอร์ม — strategy จำว่า element แต่ละชนิดต้องใช้ native หรือ JS click"""
+
+    def __init__(self, metrics=None, retries=3, retry_wait=0.05):
+        self.metrics = metrics
+        self.retries = retries
+        self.retry_wait = retry_wait
+        self.strategy = {}      # kind -> "native" / "js"
+
+    def _incr(self, name):
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+    def scroll(self, driver, el):
+        from selenium.common.exceptions import WebDriverException
+        try:
+            return driver.execute_script(_SCROLL_JS, el) == "ok"
+        except WebDriverException:
+            return False
+
+    def _click(self, driver, el, kind):
+        from selenium.common.exceptions import (
+            ElementClickInterceptedException, ElementNotInteractableException,
+            StaleElementReferenceException, WebDriverException,
+        )
+        for attempt in range(self.retries):
+            if attempt:
+                self._incr("safe_click.retry")
+                time.sleep(self.retry_wait)
+            try:
+                if self.strategy.get(kind) == "js":
+                    state = driver.execute_script(_CLICK_JS, el)
+                else:
+                    state = driver.execute_script(_PREPARE_JS, el)
+                    if state == "ok":
+                        try:
+                            el.click()
+                            self.strategy[kind] = "native"
+                            return True
+                        except (ElementClickInterceptedException, ElementNotInteractableException):
+                            state = "covered"
+                    if state in ("covered", "hidden"):
+                        self.strategy[kind] = "js"
+                        self._incr("safe_click.js_fallback")
+                        state = driver.execute_script(_CLICK_JS, el)
+                if state == "clicked":
+                    return True
+                if state in ("detached", "disabled"):
+                    self._incr(f"safe_click.{state}")
+                    return False
+            except StaleElementReferenceException:
+                self._incr("safe_click.detached")
+                return False
+            except WebDriverException:
+                pass    # ชั่วคราว (เช่น หน้ากำลัง render) — ลองใหม่
+        self._incr("safe_click.failed")
+        return False
+
+    def click(self, driver, el, kind="default"):
+        if self.metrics is None:
+            return self._click(driver, el, kind)
+        with self.metrics.span("safe_click"):
+            return self._click(driver, el, kind)
+
+    def open_dropdown(self, driver, el, timeout=3, poll=0.05):
+        """คลิก listbox แล้วรอตัวเลือกที่เลือกได้ — คืน list[Choice] ([] ถ้าไม่เปิด)"""
+        from selenium.common.exceptions import WebDriverException
+        if not self.click(driver, el, "listbox"):
+            return []
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                opts = snapshot_options(driver, choosable=True, listbox=el)
+            except WebDriverException:
+                opts = []
+            if opts or time.monotonic() >= deadline:
+                if not opts:
+                    self._incr("dropdown.timeout")
+                return opts
+            time.sleep(poll)
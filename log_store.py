@@ -0,0 +1,71 @@
+"""Log ของบอทแบบ ring buffer — ทุก event มี seq เพิ่มขึ้นเรื่อย ๆ ไม่ย้อนกลับ
+
+client อ่านต่อด้วย since=<seq ล่าสุดที่ได้> ได้เสมอ แม้ buffer จะทิ้ง event เก่าไปแล้ว
+(ถ้าตกหล่นจะได้ gap=True) ใช้ lock ตัวเดียวกันทั้งฝั่ง bot thread และ Flask threads
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+
+LEVELS = ("debug", "info", "warn", "error")
+
+
+@dataclass(slots=True, frozen=True)
+class LogEvent:
+    seq: int
+    ts: float
+    level: str
+    round: int
+    msg: str
+
+    def to_dict(self):
+        return {"seq": self.seq, "ts": self.ts, "level": self.level,
+                "round": self.round, "msg": self.msg}
+
+
+class LogStore:
+    def __init__(self, maxlen=500):
+        self._events = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self.round = 0
+
+    def append(self, msg, level="info"):
+        if level not in LEVELS:
+            raise ValueError(f"level ต้องเป็นหนึ่งใน {', '.join(LEVELS)}: {level!r}")
+        with self._lock:
+            self._seq += 1
+            ev = LogEvent(self._seq, time.time(), level, self.round, msg)
+            self._events.append(ev)
+        return ev
+
+    def clear(self):
+        """ล้าง buffer ตอนเริ่มงานใหม่ — seq ไม่ reset เพื่อให้ cursor เดิมยังใช้ได้"""
+        with self._lock:
+            self._events.clear()
+            self.round = 0
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    def read(self, since=0, levels=None, round=None, limit=None):
+        """คืน (events ที่ seq > since, last_seq, gap)"""
+        with self._lock:
+            last = self._seq
+            if not self._events:
+                return [], last, since < last
+            first = self._events[0].seq
+            gap = since + 1 < first
+            start = max(0, since + 1 - first)
+            events = list(islice(self._events, start, None))
+        if levels:
+            events = [e for e in events if e.level in levels]
+        if round is not None:
+            events = [e for e in events if e.round == round]
+        if limit is not None and len(events) > limit:
+            events = events[:limit]
+            last = events[-1].seq
+        return events, last, gap
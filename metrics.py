@@ -0,0 +1,133 @@
+"""จับเวลาแต่ละช่วงของงานบอท + นับคำสั่ง WebDriver ต่อรอบ
+
+- span(name): context manager จับเวลา เก็บ count/sum/max และตัวอย่างล่าสุด
+  SAMPLE_LIMIT ค่าไว้คิด p50/p95
+- incr(name): counter ธรรมดา (เช่น จำนวน retry ของ safe_click)
+- instrument(driver): ห่อ driver.execute — ทุกคำสั่งที่ไปหา chromedriver (ทั้งจาก
+  driver และ WebElement) ผ่านตรงนี้ จึงนับแยกตามรอบ (self.round) และชื่อคำสั่งได้
+"""
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+SAMPLE_LIMIT = 2048
+
+
+def _quantile(sorted_vals, q):
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+class _Series:
+    __slots__ = ("count", "sum", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_LIMIT)
+
+    def add(self, v):
+        self.count += 1
+        self.sum += v
+        if v > self.max:
+            self.max = v
+        self.samples.append(v)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+            self._counters = Counter()
+            self._calls = {}        # round -> Counter(command)
+            self.round = 0
+
+    def observe(self, name, seconds):
+        with self._lock:
+            s = self._series.get(name)
+            if s is None:
+                s = self._series[name] = _Series()
+            s.add(seconds)
+
+    @contextmanager
+    def span(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def count_call(self, command):
+        with self._lock:
+            c = self._calls.get(self.round)
+            if c is None:
+                c = self._calls[self.round] = Counter()
+            c[command] += 1
+
+    def instrument(self, driver):
+        """นับทุกคำสั่ง WebDriver ของ driver นี้ (ห่อซ้ำได้อย่างปลอดภัย)"""
+        execute = getattr(driver, "_unwrapped_execute", None) or getattr(driver, "execute", None)
+        if execute is None:
+            return driver
+
+        def counted(command, params=None):
+            self.count_call(command)
+            return execute(command, params)
+
+        driver._unwrapped_execute = execute
+        driver.execute = counted
+        return driver
+
+    def snapshot(self):
+        with self._lock:
+            spans = {}
+            for name, s in self._series.items():
+                vals = sorted(s.samples)
+                spans[name] = {
+                    "count": s.count, "sum": s.sum, "max": s.max,
+                    "p50": _quantile(vals, 0.50), "p95": _quantile(vals, 0.95),
+                }
+            calls = {str(r): {"total": sum(c.values()), "by_command": dict(c)}
+                     for r, c in sorted(self._calls.items())}
+            return {"spans": spans, "counters": dict(self._counters), "webdriver_calls": calls}
+
+
+def _label(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def to_prometheus(snap, prefix="bot"):
+    """แปลง snapshot เป็น Prometheus text exposition format"""
+    lines = [f"# TYPE {prefix}_span_seconds summary"]
+    for name, s in sorted(snap.get("spans", {}).items()):
+        lbl = f'span="{_label(name)}"'
+        lines.append(f'{prefix}_span_seconds{{{lbl},quantile="0.5"}} {s["p50"]:.6f}')
+        lines.append(f'{prefix}_span_seconds{{{lbl},quantile="0.95"}} {s["p95"]:.6f}')
+        lines.append(f"{prefix}_span_seconds_sum{{{lbl}}} {s['sum']:.6f}")
+        lines.append(f"{prefix}_span_seconds_count{{{lbl}}} {s['count']}")
+    lines.append(f"# TYPE {prefix}_span_seconds_max gauge")
+    for name, s in sorted(snap.get("spans", {}).items()):
+        lines.append(f'{prefix}_span_seconds_max{{span="{_label(name)}"}} {s["max"]:.6f}')
+    lines.append(f"# TYPE {prefix}_events_total counter")
+    for name, v in sorted(snap.get("counters", {}).items()):
+        lines.append(f'{prefix}_events_total{{event="{_label(name)}"}} {v}')
+    lines.append(f"# TYPE {prefix}_webdriver_calls_total counter")
+    for rnd, c in snap.get("webdriver_calls", {}).items():
+        for cmd, v in sorted(c["by_command"].items()):
+            lines.append(f'{prefix}_webdriver_calls_total{{round="{rnd}",command="{_label(cmd)}"}} {v}')
+    return "\n".join(lines) + "\n"
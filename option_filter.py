@@ -0,0 +1,41 @@
+"""กรองตัวเลือกก่อนสุ่ม — คำต้องห้าม + ตัวเลือก "อื่นๆ"
+
+คำต้องห้ามทั้งหมดถูก compile เป็น regex ตัวเดียวตอนสร้างบอท (เทียบกับข้อความที่
+ตัดช่องว่างและ lower แล้ว) และผลของแต่ละ label ถูก cache ไว้ เพราะตัวเลือกชุดเดิม
+วนกลับมาทุกรอบ
+"""
+import re
+
+
+def normalize(raw):
+    """ตัดช่องว่างทั้งหมดออก เหมือนที่ smart_select เดิมทำ"""
+    return "".join((raw or "").split())
+
+
+class OptionFilter:
+    CACHE_LIMIT = 4096
+
+    def __init__(self, forbidden_words=()):
+        words = {normalize(w).lower() for w in forbidden_words}
+        words.discard("")
+        # คำยาวก่อน — ไม่จำเป็นต่อความถูกต้อง แต่ทำให้ regex ตัดสินเร็วขึ้นเมื่อคำซ้อนกัน
+        ordered = sorted(words, key=len, reverse=True)
+        self._pattern = re.compile("|".join(map(re.escape, ordered))) if ordered else None
+        self._cache = {}
+
+    def classify(self, raw):
+        """คืน None ถ้าใช้ได้, "other" ถ้าเป็นตัวเลือกอื่นๆ, "forbidden" ถ้าติดคำต้องห้าม"""
+        hit = self._cache.get(raw, False)
+        if hit is not False:
+            return hit
+        lowered = normalize(raw).lower()
+        if "อื่นๆ" in lowered or "other" in lowered:
+            verdict = "other"
+        elif self._pattern is not None and self._pattern.search(lowered):
+            verdict = "forbidden"
+        else:
+            verdict = None
+        if len(self._cache) >= self.CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[raw] = verdict
+        return verdict
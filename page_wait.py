@@ -0,0 +1,105 @@
+"""รอหน้าเปลี่ยน / ฟอร์มพร้อม / หน้ายืนยัน จากสภาพ DOM แทน time.sleep ตายตัว
+
+ก่อนกดปุ่ม ถัดไป/ส่ง ให้ mark() หน้าปัจจุบันไว้ (ฝาก token + signature ของ
+listitem ไว้ใน window) แล้ว page_change() จะ poll ด้วย JS สั้น ๆ จนกว่า
+document ใหม่จะโหลด (token หาย) หรือชุดคำถามเปลี่ยน — หน้าเร็วไม่ต้องรอเปล่า
+หน้าช้าก็ไม่วิ่งนำไปก่อน ทุกครั้งที่รอจะถูกสรุปรวมต่อชื่อไว้ใน stats (count/total/max/
+timeouts — ขนาดคงที่แม้งานยาว) และส่งเข้า metrics เป็น span "wait.<name>" ถ้าให้มา
+"""
+import time
+
+CONFIRM_XPATH = ("//*[contains(text(),'บันทึกคำตอบ') or "
+                 "contains(text(),'response has been recorded') or "
+                 "contains(text(),'ส่งคำตอบเพิ่ม')]")
+
+_SIG_JS = r"""
+const sig = () => {
+  let s = "";
+  document.querySelectorAll('div[role="listitem"]').forEach(q => {
+    const h = q.querySelector('div[role="heading"]');
+    s += (h ? h.innerText : "").slice(0, 40) + "|";
+  });
+  return location.href + "#" + s;
+};
+"""
+
+_MARK_JS = _SIG_JS + r"""
+const token = Date.now() + ":" + Math.random();
+window.__botPageMark = token;
+window.__botPageSig = sig();
+return token;
+"""
+
+_CHANGED_JS = _SIG_JS + r"""
+if (document.readyState === "loading") return false;
+if (window.__botPageMark === arguments[0] && window.__botPageSig === sig()) return false;
+return !!document.querySelector('div[role="listitem"], div[role="button"]')
+    || (document.body && document.body.innerText.length > 0);
+"""
+
+_READY_JS = r"""
+return document.readyState !== "loading"
+    && !!document.querySelector('div[role="listitem"], div[role="button"]');
+"""
+
+
+class PageWaiter:
+    def __init__(self, page_timeout=10, confirm_timeout=5, poll=0.05, metrics=None):
+        self.page_timeout = page_timeout
+        self.confirm_timeout = confirm_timeout
+        self.poll = poll
+        self.metrics = metrics
+        self.stats = {}     # name -> {"count", "total", "max", "timeouts"}
+
+    def _until(self, name, driver, timeout, cond):
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        t0 = time.perf_counter()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=self.poll,
+                          ignored_exceptions=[WebDriverException]).until(cond)
+            ok = True
+        except TimeoutException:
+            ok = False
+        secs = time.perf_counter() - t0
+        s = self.stats.get(name)
+        if s is None:
+            s = self.stats[name] = {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0}
+        s["count"] += 1
+        s["total"] += secs
+        s["max"] = max(s["max"], secs)
+        s["timeouts"] += 0 if ok else 1
+        if self.metrics is not None:
+            self.metrics.observe(f"wait.{name}", secs)
+            if not ok:
+                self.metrics.incr(f"wait.{name}.timeout")
+        return ok
+
+    def mark(self, driver):
+        """เรียกก่อนกดปุ่มที่จะเปลี่ยนหน้า คืน token ไว้ส่งให้ page_change"""
+        from selenium.common.exceptions import WebDriverException
+        try:
+            return driver.execute_script(_MARK_JS)
+        except WebDriverException:
+            return None
+
+    def page_change(self, driver, token):
+        return self._until("page_change", driver, self.page_timeout,
+                           lambda d: d.execute_script(_CHANGED_JS, token))
+
+    def form_ready(self, driver):
+        return self._until("form_ready", driver, self.page_timeout,
+                           lambda d: d.execute_script(_READY_JS))
+
+    def confirmation(self, driver):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        return self._until("confirmation", driver, self.confirm_timeout,
+                           EC.presence_of_element_located((By.XPATH, CONFIRM_XPATH)))
+
+    def summary(self):
+        """{name: {"count", "avg", "max", "timeouts"}}"""
+        return {name: {"count": s["count"], "avg": s["total"] / s["count"],
+                       "max": s["max"], "timeouts": s["timeouts"]}
+                for name, s in self.stats.items()}
@@ -0,0 +1,93 @@
+"""profile งานบอทหนึ่งงาน (เปิดด้วย config "profile": true เท่านั้น)
+
+RunProfiler.run(fn) รัน fn ใน thread ปัจจุบันภายใต้ cProfile และมี thread เล็ก ๆ
+คอยสุ่มอ่าน stack ของ thread นั้นทุก interval วินาที ผลลัพธ์มีสองไฟล์:
+- <id>.pstats      — โหลดด้วย pstats / snakeviz ได้
+- <id>.collapsed   — "frame;frame;frame count" ต่อบรรทัด ใช้กับ flamegraph.pl / speedscope
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+KINDS = {"pstats": ".pstats", "collapsed": ".collapsed"}
+# key ที่ pstats.Stats.sort_stats รับ — ค่าอื่นทำให้ KeyError
+SORT_KEYS = ("cumulative", "cumtime", "tottime", "time", "calls", "ncalls", "pcalls",
+             "filename", "module", "line", "name", "nfl", "stdname")
+
+
+def _frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RunProfiler:
+    def __init__(self, directory=DEFAULT_DIR, interval=0.005):
+        self.directory = directory
+        self.interval = interval
+        self.id = time.strftime("bot-%Y%m%d-%H%M%S")
+        self.stacks = Counter()
+        self.seconds = 0.0
+        self._profile = cProfile.Profile()
+        self._stop = threading.Event()
+
+    def _sample(self, tid):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(tid)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def run(self, fn, *args, **kwargs):
+        sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),), daemon=True)
+        sampler.start()
+        t0 = time.perf_counter()
+        self._profile.enable()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._profile.disable()
+            self.seconds = time.perf_counter() - t0
+            self._stop.set()
+            sampler.join()
+
+    def save(self):
+        """เขียนไฟล์ทั้งสองแล้วคืน dict สำหรับเก็บใน status"""
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.id)
+        self._profile.dump_stats(base + KINDS["pstats"])
+        tmp = base + KINDS["collapsed"] + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+        os.replace(tmp, base + KINDS["collapsed"])
+        return {"id": self.id, "seconds": round(self.seconds, 3),
+                "samples": sum(self.stacks.values()), "interval": self.interval}
+
+
+def profile_path(profile_id, kind, directory=DEFAULT_DIR):
+    """path ของไฟล์ profile — None ถ้า kind/id ไม่ถูกต้องหรือไม่มีไฟล์"""
+    ext = KINDS.get(kind)
+    if not ext or not profile_id or os.path.basename(profile_id) != profile_id:
+        return None
+    path = os.path.join(directory, profile_id + ext)
+    return path if os.path.exists(path) else None
+
+
+def top_text(profile_id, limit=40, sort="cumulative", directory=DEFAULT_DIR):
+    """สรุปฟังก์ชันที่กินเวลามากสุดแบบ text (สำหรับดูเร็ว ๆ ใน browser)"""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort ต้องเป็นหนึ่งใน {', '.join(SORT_KEYS)}")
+    path = profile_path(profile_id, "pstats", directory)
+    if path is None:
+        return None
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,88 @@
+"""รายงานผลรายรอบของงานบอท — เขียนต่อท้ายไฟล์ JSONL ทันทีที่แต่ละรอบจบ
+
+หนึ่งงาน = หนึ่งไฟล์ reports/<id>.jsonl ไม่เก็บ record ไว้ใน memory งานยาวแค่ไหน
+memory ก็คงที่ และประวัติยังอยู่แม้ process restart ฝั่งอ่านก็ stream ทีละบรรทัด
+(iter_jsonl / iter_csv) ไม่โหลดทั้งไฟล์
+"""
+import csv
+import io
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+CSV_FIELDS = ("round", "kind", "started", "ended", "seconds", "ok", "failure",
+              "pages", "page_seconds", "retries", "answers")
+
+
+@dataclass(slots=True)
+class RoundRecord:
+    round: int
+    kind: str                   # learn / replay
+    started: float
+    ended: float = 0.0
+    ok: bool = False
+    failure: str | None = None  # เหตุผลที่รอบไม่สำเร็จ
+    pages: list = field(default_factory=list)      # [{"page", "seconds"}]
+    retries: dict = field(default_factory=dict)    # counter ของ safe_click ที่เพิ่มในรอบนี้
+    answers: list = field(default_factory=list)    # [{"page", "q", "kind", "value"}]
+
+    def to_dict(self):
+        d = asdict(self)
+        d["seconds"] = round(self.ended - self.started, 3)
+        return d
+
+
+class RunReport:
+    def __init__(self, directory=DEFAULT_DIR, report_id=None):
+        self.id = report_id or time.strftime("run-%Y%m%d-%H%M%S-") + os.urandom(2).hex()
+        self.path = os.path.join(directory, self.id + ".jsonl")
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, record):
+        line = json.dumps(record.to_dict(), ensure_ascii=False)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def report_path(report_id, directory=DEFAULT_DIR):
+    """path ของรายงาน — None ถ้า id ไม่ถูกต้องหรือไม่มีไฟล์"""
+    if not report_id or os.path.basename(report_id) != report_id:
+        return None
+    path = os.path.join(directory, report_id + ".jsonl")
+    return path if os.path.exists(path) else None
+
+
+def iter_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield line if line.endswith("\n") else line + "\n"
+
+
+def _csv_row(rec):
+    return [
+        rec.get("round"), rec.get("kind"),
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(rec.get("started", 0))),
+        time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(rec.get("ended", 0))),
+        rec.get("seconds"), rec.get("ok"), rec.get("failure") or "",
+        len(rec.get("pages") or []),
+        ";".join(f"{p['seconds']:.3f}" for p in rec.get("pages") or []),
+        sum((rec.get("retries") or {}).values()),
+        json.dumps(rec.get("answers") or [], ensure_ascii=False),
+    ]
+
+
+def iter_csv(path):
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(CSV_FIELDS)
+    for line in iter_jsonl(path):
+        w.writerow(_csv_row(json.loads(line)))
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
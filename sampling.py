@@ -0,0 +1,52 @@
+"""ตารางสุ่มตัวเลือกที่ compute ไว้ล่วงหน้าสำหรับ smart_select
+
+น้ำหนักของแต่ละคำถามขึ้นกับ (จำนวนตัวเลือก, ตัวเลือกที่ใช้ได้, matrix หรือไม่) เท่านั้น
+จึง cache cumulative weights ไว้ต่อ key แล้วสุ่มด้วย bisect — ได้ผลเหมือน
+random.choices(weights=...) ทุกประการเมื่อใช้ RNG state เดียวกัน แต่ไม่ต้องสร้าง
+list น้ำหนัก/บวกสะสมใหม่ทุกครั้งที่คลิก
+"""
+import random
+from bisect import bisect
+from itertools import accumulate
+
+
+class WeightedSampler:
+    def __init__(self, weight_map=None, dist_mode=1, seed=None):
+        self.rng = random.Random(seed)
+        self.configure(weight_map, dist_mode)
+
+    def configure(self, weight_map=None, dist_mode=1):
+        """เปลี่ยน config แล้วล้างตารางเดิมทิ้งทั้งหมด"""
+        self.weight_map = {int(k): v for k, v in (weight_map or {}).items()}
+        self.dist_mode = int(dist_mode)
+        self._tables = {}
+
+    def _build(self, total, valid_idx, is_matrix_row):
+        if total in self.weight_map:
+            wm = self.weight_map[total]
+            ws = [wm[i] if i < len(wm) else 0 for i in valid_idx]
+            if sum(ws) > 0:
+                return list(accumulate(ws))
+        if self.dist_mode > 1 and not is_matrix_row:
+            n = len(valid_idx)
+            if self.dist_mode == 2:
+                ws = [1/(i+1) for i in range(n)]
+            else:
+                ws = [1/((i+1)**2) for i in range(n)]
+            return list(accumulate(ws))
+        return None   # uniform
+
+    def table(self, total, valid_idx, is_matrix_row=False):
+        key = (total, tuple(valid_idx), bool(is_matrix_row))
+        try:
+            return self._tables[key]
+        except KeyError:
+            t = self._tables[key] = self._build(total, valid_idx, is_matrix_row)
+            return t
+
+    def pick(self, items, total, valid_idx, is_matrix_row=False):
+        """items[i] คือตัวเลือกที่ตำแหน่ง valid_idx[i] จากทั้งหมด total ตัว"""
+        cum = self.table(total, valid_idx, is_matrix_row)
+        if cum is None:
+            return self.rng.choice(items)
+        return items[bisect(cum, self.rng.random() * cum[-1], 0, len(cum) - 1)]
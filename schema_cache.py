@@ -0,0 +1,81 @@
+"""เก็บผลรอบเรียนรู้ลงดิสก์ เพื่อให้ start_bot ครั้งถัดไปกับฟอร์มเดิมข้าม scan_and_learn ได้
+
+หนึ่งไฟล์ JSON ต่อหนึ่ง URL (ชื่อไฟล์ = sha1 ของ URL) เก็บ memory ทุกหน้าพร้อม
+structure hash ของแต่ละหน้า และ page_logic_buffer — ถ้าโครงสร้างหน้าแรกที่เปิดอยู่
+ไม่ตรงกับที่บันทึกไว้ หรือ SCHEMA_VERSION เปลี่ยน entry นั้นจะถูกทิ้ง
+"""
+import hashlib
+import json
+import os
+import time
+
+from form_memory import PageRecord
+
+SCHEMA_VERSION = 1
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schema_cache")
+
+
+def structure_hash(snap):
+    """hash ของโครงสร้างหน้า (หัวข้อ + จำนวน/ชนิดช่อง) — ไม่รวมค่าที่กรอกหรือที่ถูกเลือก"""
+    parts = []
+    for q in snap.questions:
+        parts.append("|".join([
+            (q.heading or "").strip(),
+            ",".join(str(len(g)) for g in q.radiogroups),
+            str(len(q.radios)),
+            str(len(q.checkboxes)),
+            "".join("t" if f.text_index >= 0 else "i" for f in q.inputs),
+            str(len(q.listboxes)),
+        ]))
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class SchemaCache:
+    def __init__(self, directory=DEFAULT_DIR):
+        self.directory = directory
+
+    def _path(self, url):
+        return os.path.join(self.directory,
+                            hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url, first_page_hash):
+        """คืน (memory, page_logic_buffer) หรือ None ถ้าไม่มี/ใช้ไม่ได้"""
+        path = self._path(url)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            pages = entry.get("pages") or []
+            if (entry.get("version") != SCHEMA_VERSION or entry.get("url") != url
+                    or not pages or pages[0].get("structure") != first_page_hash):
+                self.invalidate(url)
+                return None
+            return [PageRecord.from_dict(p) for p in pages], entry.get("page_logic_buffer", {})
+        except (KeyError, TypeError, AttributeError, ValueError):
+            # entry เสีย / ถูกแก้มือ (เช่น ไม่มี "type" หรือชนิดที่ไม่รู้จัก) — ทิ้งแล้วเรียนรู้ใหม่
+            self.invalidate(url)
+            return None
+
+    def save(self, url, memory, page_logic_buffer):
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {
+            "version": SCHEMA_VERSION,
+            "url": url,
+            "saved_at": time.time(),
+            "pages": [p.to_dict() for p in memory],
+            "page_logic_buffer": page_logic_buffer,
+        }
+        path = self._path(url)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def invalidate(self, url):
+        try:
+            os.remove(self._path(url))
+        except OSError:
+            pass
@@ -0,0 +1,215 @@
+"""ที่เก็บสถานะงาน + log ที่เลือกได้ ตาม BOT_STATE_BACKEND
+
+- "memory" (ค่าเริ่มต้น): BotStatus + LogStore ใน process — พอสำหรับ server ตัวเดียว
+- "sqlite": เก็บใน SQLite (BOT_STATE_DB, ค่าเริ่มต้น user.db) ให้ gunicorn หลาย worker
+  เห็นงานเดียวกัน — status / answers / stop ที่ worker ไหนเขียน bot thread ก็อ่านเจอ
+  และ log ที่ bot thread เขียน worker ไหนก็อ่านได้ ฝั่งนี้ไม่มี Condition ข้าม process
+  จึง wait_for ด้วยการ poll ทุก BOT_STATE_POLL วินาที
+
+ทั้งสองแบบมี interface เดียวกับ BotStatus / LogStore
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from bot_state import BotStatus
+from log_store import LEVELS, LogEvent, LogStore
+
+DEFAULT_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "user.db")
+
+
+class _Sqlite:
+    """หนึ่ง connection ต่อ (process, thread)
+
+    connection ที่ติดมาจาก process แม่ตอน fork (gunicorn --preload import ก่อน fork
+    worker) ห้ามใช้ต่อ — ถ้า pid เปลี่ยนจะเปิดใหม่ และเก็บตัวเก่าไว้เฉย ๆ ไม่ close
+    (close ใน process ลูกอาจ checkpoint/ลบ WAL ที่แม่ยังใช้อยู่)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._inherited = []
+
+    def _open(self):
+        c = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        c.execute("PRAGMA journal_mode=WAL")
+        c.execute("PRAGMA synchronous=NORMAL")
+        return c
+
+    def conn(self):
+        pid = os.getpid()
+        cached = getattr(self._local, "conn", None)
+        if cached is not None and cached[0] == pid:
+            return cached[1]
+        if cached is not None:
+            self._inherited.append(cached[1])
+        c = self._open()
+        self._local.conn = (pid, c)
+        return c
+
+    @contextmanager
+    def setup(self):
+        """connection ชั่วคราวไว้สร้าง schema — ตอน import จะไม่เหลือ connection ค้างไว้ให้ fork"""
+        c = self._open()
+        try:
+            yield c
+        finally:
+            c.close()
+
+
+class SqliteStatus:
+    def __init__(self, db, initial, poll=0.2):
+        self.db = db
+        self.poll = poll
+        self._cached = (None, MappingProxyType({}))
+        with db.setup() as c:
+            c.execute("CREATE TABLE IF NOT EXISTS bot_status (key TEXT PRIMARY KEY, value TEXT)")
+            c.execute("CREATE TABLE IF NOT EXISTS bot_meta (key TEXT PRIMARY KEY, value INTEGER)")
+            c.execute("INSERT OR IGNORE INTO bot_meta VALUES ('version', 0)")
+            c.execute("INSERT OR IGNORE INTO bot_meta VALUES ('epoch', ?)",
+                      (int.from_bytes(os.urandom(4), "big"),))
+            self.epoch = format(c.execute(
+                "SELECT value FROM bot_meta WHERE key='epoch'").fetchone()[0], "08x")
+            c.executemany("INSERT OR IGNORE INTO bot_status VALUES (?, ?)",
+                          [(k, json.dumps(v)) for k, v in initial.items()])
+
+    @property
+    def version(self):
+        return self.db.conn().execute(
+            "SELECT value FROM bot_meta WHERE key='version'").fetchone()[0]
+
+    def snapshot(self):
+        c = self.db.conn()
+        c.execute("BEGIN")
+        try:
+            version = c.execute("SELECT value FROM bot_meta WHERE key='version'").fetchone()[0]
+            if version != self._cached[0]:
+                rows = c.execute("SELECT key, value FROM bot_status").fetchall()
+                self._cached = (version, MappingProxyType({k: json.loads(v) for k, v in rows}))
+            return self._cached
+        finally:
+            c.execute("COMMIT")
+
+    def get(self, key, default=None):
+        return self.snapshot()[1].get(key, default)
+
+    def __getitem__(self, key):
+        return self.snapshot()[1][key]
+
+    def _commit(self, c, fields):
+        c.executemany("INSERT OR REPLACE INTO bot_status VALUES (?, ?)",
+                      [(k, json.dumps(v)) for k, v in fields.items()])
+        c.execute("UPDATE bot_meta SET value = value + 1 WHERE key='version'")
+
+    def update(self, **fields):
+        self.update_if(lambda st: True, **fields)
+
+    def update_if(self, predicate, **fields):
+        c = self.db.conn()
+        c.execute("BEGIN IMMEDIATE")   # lock เขียนข้าม process ตั้งแต่ตอนอ่าน
+        try:
+            rows = c.execute("SELECT key, value FROM bot_status").fetchall()
+            if not predicate(MappingProxyType({k: json.loads(v) for k, v in rows})):
+                c.execute("ROLLBACK")
+                return False
+            self._commit(c, fields)
+            c.execute("COMMIT")
+            return True
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+
+    def notify(self):
+        pass   # ผู้รอ poll เอง
+
+    def wait_for(self, predicate, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if predicate():
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll)
+
+
+class SqliteLogStore:
+    def __init__(self, db, maxlen=500):
+        self.db = db
+        self.maxlen = maxlen
+        self.round = 0
+        with db.setup() as c:
+            c.execute("CREATE TABLE IF NOT EXISTS bot_logs (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                      "ts REAL, level TEXT, round INTEGER, msg TEXT)")
+
+    def append(self, msg, level="info"):
+        if level not in LEVELS:
+            raise ValueError(f"level ต้องเป็นหนึ่งใน {', '.join(LEVELS)}: {level!r}")
+        c = self.db.conn()
+        ts = time.time()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            seq = c.execute("INSERT INTO bot_logs (ts, level, round, msg) VALUES (?, ?, ?, ?)",
+                            (ts, level, self.round, msg)).lastrowid
+            if seq % 50 == 0:
+                c.execute("DELETE FROM bot_logs WHERE seq <= ?", (seq - self.maxlen,))
+            c.execute("COMMIT")
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+        return LogEvent(seq, ts, level, self.round, msg)
+
+    def clear(self):
+        # AUTOINCREMENT ไม่ใช้ seq ซ้ำ แม้ลบหมด — cursor เดิมยังใช้ได้
+        self.db.conn().execute("DELETE FROM bot_logs")
+        self.round = 0
+
+    @property
+    def last_seq(self):
+        row = self.db.conn().execute(
+            "SELECT seq FROM sqlite_sequence WHERE name='bot_logs'").fetchone()
+        return row[0] if row else 0
+
+    def read(self, since=0, levels=None, round=None, limit=None):
+        c = self.db.conn()
+        c.execute("BEGIN")
+        try:
+            last = self.last_seq
+            floor = max(since, last - self.maxlen)
+            sql = "SELECT seq, ts, level, round, msg FROM bot_logs WHERE seq > ?"
+            args = [floor]
+            if levels:
+                sql += f" AND level IN ({','.join('?' * len(levels))})"
+                args += list(levels)
+            if round is not None:
+                sql += " AND round = ?"
+                args.append(round)
+            sql += " ORDER BY seq"
+            if limit is not None:
+                sql += " LIMIT ?"
+                args.append(limit)
+            events = [LogEvent(*r) for r in c.execute(sql, args)]
+            first = c.execute("SELECT MIN(seq) FROM bot_logs WHERE seq > ?",
+                              (last - self.maxlen,)).fetchone()[0]
+        finally:
+            c.execute("COMMIT")
+        gap = (since + 1 < first) if first is not None else since < last
+        if limit is not None and len(events) == limit:
+            last = events[-1].seq
+        return events, last, gap
+
+
+def make_backend(initial, maxlen=500):
+    """คืน (status, logs) ตาม BOT_STATE_BACKEND"""
+    kind = os.environ.get("BOT_STATE_BACKEND", "memory").lower()
+    if kind == "sqlite":
+        db = _Sqlite(os.environ.get("BOT_STATE_DB", DEFAULT_DB))
+        poll = float(os.environ.get("BOT_STATE_POLL", 0.2))
+        return SqliteStatus(db, initial, poll), SqliteLogStore(db, maxlen)
+    if kind != "memory":
+        raise RuntimeError(f"ไม่รู้จัก BOT_STATE_BACKEND={kind}")
+    return BotStatus(**initial), LogStore(maxlen)